@@ -15,23 +15,23 @@ if not jwt_secret:
     print("Error: No JWT secret provided")
     exit(1)
 
-# Read existing .env
+# Read existing .env in one go
+data = env_file.read_text(encoding="utf-8") if env_file.exists() else ""
 env_vars = {}
-if env_file.exists():
-    with open(env_file, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env_vars[key.strip()] = value.strip()
+for line in data.splitlines():
+    line = line.strip()
+    if line and not line.startswith("#") and "=" in line:
+        key, value = line.split("=", 1)
+        env_vars[key.strip()] = value.strip()
 
 # Add or update JWT secret
 env_vars["SUPABASE_JWT_SECRET"] = jwt_secret
 
-# Write back to .env
-with open(env_file, "w", encoding="utf-8") as f:
-    for key, value in env_vars.items():
-        f.write(f"{key}={value}\n")
+# Write back to .env in a single write
+env_file.write_text(
+    "".join(f"{key}={value}\n" for key, value in env_vars.items()),
+    encoding="utf-8",
+)
 
 print("\nSUCCESS: SUPABASE_JWT_SECRET added to .env file")
 print("\nNow restart your backend server:")
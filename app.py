@@ -2,88 +2,255 @@
 """
 Simple TrackMail Backend Entry Point
 """
+import asyncio
+import atexit
+import logging
 import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import orjson
 import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, Response
 
-# Create the main app
-app = FastAPI(
-    title="TrackMail API",
-    description="Job application tracking system",
-    version="1.0.0"
-)
+from app.config import settings
+from app.log import configure_logging, shutdown_logging
+from app.responses import ORJSONResponse
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+logger = logging.getLogger(__name__)
+
+
+# Log through a queue; the listener thread is stopped (and flushed) at exit
+if configure_logging(settings.log_level):
+    atexit.register(shutdown_logging)
+
+
+# CORS headers that never change, encoded once instead of per response
+_CORS_RESPONSE_HEADERS = (
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+)
+# Non-preflight responses also expose the pagination headers to scripts
+_CORS_SIMPLE_HEADERS = (
+    *_CORS_RESPONSE_HEADERS,
+    (b"access-control-expose-headers", b"Link, X-Next-Cursor"),
+)
+_CORS_PREFLIGHT_HEADERS = (
+    *_CORS_RESPONSE_HEADERS,
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"2"),
+    (b"content-type", b"text/plain; charset=utf-8"),
 )
 
-# Add basic health endpoint first
-@app.get("/health")
-async def basic_health():
-    return {"status": "healthy", "message": "TrackMail Backend is running"}
 
-@app.get("/")
-async def root():
-    return {"name": "TrackMail API", "version": "1.0.0", "status": "running"}
+class AllowlistCORSMiddleware:
+    """
+    Minimal ASGI CORS middleware for a fixed origin allowlist.
+
+    Checks the Origin header against a frozenset and appends pre-encoded
+    Access-Control-* headers. An "*" entry allows any origin (the origin
+    is echoed back, since credentials are allowed).
+    """
 
-# Import and include the main TrackMail app
-print("🔄 Attempting to load TrackMail main app...")
-try:
-    print("📦 Importing app.main...")
+    def __init__(self, app, allowed_origins: list[str]):
+        self.app = app
+        self.allow_all = "*" in allowed_origins
+        self.allowed = frozenset(origin.encode("latin-1") for origin in allowed_origins)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None or not (self.allow_all or origin in self.allowed):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            # Preflight: answer directly, echoing the requested headers
+            headers = [(b"access-control-allow-origin", origin), *_CORS_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    *_CORS_SIMPLE_HEADERS,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+# Set once the main app's routes are mounted (or the fallbacks are)
+_trackmail_ready = asyncio.Event()
+
+
+class WaitForTrackmailMiddleware:
+    """
+    Hold /v1/* requests until the main app's routes are mounted.
+
+    The port opens before app.main is imported, so on a cold start the
+    request that woke the instance would otherwise hit no route. It waits
+    here instead and is then routed normally; /health is not held.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and not _trackmail_ready.is_set()
+            and scope["path"].startswith("/v1/")
+        ):
+            await _trackmail_ready.wait()
+        await self.app(scope, receive, send)
+
+
+def _import_trackmail_app() -> FastAPI:
+    """Import the main TrackMail app (pulls in the full router/service graph)."""
     from app.main import app as trackmail_app
-    print("✅ Successfully imported app.main")
-    
-    # Include the main app routes instead of mounting
-    print("🔗 Including main app routes...")
-    app.include_router(trackmail_app.router, prefix="/v1")
-    print("✅ Successfully loaded TrackMail main app")
-    
-except ImportError as e:
-    print(f"❌ Could not import main app: {e}")
-    print("📋 Setting up fallback routes...")
-    # Fallback routes
-    @app.get("/v1/health")
-    async def health():
-        return {"status": "healthy", "message": "Backend is running (fallback mode)"}
-    
-    @app.post("/v1/ingest/email")
-    async def ingest_email():
-        return {"message": "Email ingest endpoint - not implemented yet (fallback mode)"}
-    
-    @app.post("/ingest/email")
-    async def ingest_email_no_prefix():
-        return {"message": "Email ingest endpoint - not implemented yet (fallback mode)"}
-    
-except Exception as e:
-    print(f"❌ Error loading main app: {e}")
-    print("📋 Setting up fallback routes...")
-    # Fallback routes
-    @app.get("/v1/health")
-    async def health():
-        return {"status": "healthy", "message": "Backend is running (fallback mode)"}
-    
+    return trackmail_app
+
+
+def _add_fallback_routes(app: FastAPI) -> None:
+    """Register placeholder routes used when the main app fails to load."""
+    logger.info("Setting up fallback routes")
+
     @app.post("/v1/ingest/email")
     async def ingest_email():
         return {"message": "Email ingest endpoint - not implemented yet (fallback mode)"}
-    
+
     @app.post("/ingest/email")
     async def ingest_email_no_prefix():
         return {"message": "Email ingest endpoint - not implemented yet (fallback mode)"}
 
-print("🎉 App setup complete!")
+
+async def _include_trackmail_routes(app: FastAPI, exit_stack: AsyncExitStack) -> None:
+    """
+    Import the main TrackMail app in a worker thread and mount its routes.
+
+    Runs in the background after startup, so /health answers immediately on
+    a cold start instead of waiting for the whole import graph. Only the
+    routes are copied over, so the main app's own lifespan (database pool,
+    Supabase client) is entered on exit_stack before they're mounted and
+    exited when this app shuts down.
+    """
+    logger.info("Loading TrackMail main app")
+    try:
+        trackmail_app = await asyncio.to_thread(_import_trackmail_app)
+        await exit_stack.enter_async_context(
+            trackmail_app.router.lifespan_context(trackmail_app)
+        )
+
+        # Include the main app routes instead of mounting
+        app.include_router(trackmail_app.router, prefix="/v1")
+        logger.info("Loaded TrackMail main app")
+
+    except ImportError as e:
+        logger.warning("Could not import main app: %s", e)
+        _add_fallback_routes(app)
+
+    except Exception as e:
+        logger.exception("Error loading main app: %s", e)
+        _add_fallback_routes(app)
+
+    finally:
+        # Routes are in place now; release the held requests and drop any
+        # OpenAPI schema generated before they existed
+        app.openapi_schema = None
+        _trackmail_ready.set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start loading the main app in the background; don't block startup on it.
+
+    On shutdown the main app's lifespan is exited too, closing its pool.
+    """
+    async with AsyncExitStack() as exit_stack:
+        load_task = asyncio.create_task(_include_trackmail_routes(app, exit_stack))
+        try:
+            yield
+        finally:
+            load_task.cancel()
+            try:
+                await load_task
+            except asyncio.CancelledError:
+                pass
+
+
+# Create the main app
+app = FastAPI(
+    title="TrackMail API",
+    description="Job application tracking system",
+    version="1.0.0",
+    # Same default as app.main, for the routes defined here (fallbacks)
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Hold /v1/* requests until the main app is loaded
+app.add_middleware(WaitForTrackmailMiddleware)
+
+# Add CORS middleware
+app.add_middleware(
+    AllowlistCORSMiddleware,
+    allowed_origins=settings.get_cors_origins_list(),
+)
+
+# Constant bodies, encoded once instead of serialized per request
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "message": "TrackMail Backend is running"})
+_ROOT_BODY = orjson.dumps({"name": "TrackMail API", "version": "1.0.0", "status": "running"})
+
+# Add basic health endpoint first. /health answers as soon as the port is
+# open; /v1/health is held with the rest of /v1/* until the main app is
+# loaded, so it reports readiness
+@app.get("/health", response_class=Response)
+@app.get("/v1/health", response_class=Response)
+async def basic_health():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+@app.get("/", response_class=Response)
+async def root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8080))  # Cloud Run uses 8080
+    # One worker per core (capped at 4) unless WEB_CONCURRENCY says otherwise
+    workers = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
     uvicorn.run(
-        app,
+        # Workers are spawned processes and need an import string; "app:app"
+        # would resolve to the app/ package, so point at this script instead
+        "__main__:app" if workers > 1 else app,
         host="0.0.0.0",
         port=port,
-        workers=1,
-        log_level="info"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # no uvloop on Windows
+        http="httptools",
+        workers=workers,
+        log_level="info",
+        # Leave handler setup to configure_logging: uvicorn's loggers then
+        # propagate to the root queue handler instead of writing to stderr
+        # from the event loop
+        log_config=None,
+        access_log=False,  # Cloud Run already logs every request
     )
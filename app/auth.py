@@ -22,29 +22,103 @@ Security considerations:
 - Signature validation ensures token hasn't been tampered with
 """
 
+import asyncio
+import base64
+import hashlib
+import logging
+import secrets
+import threading
+import time
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException, status
+import jwt
+import orjson
+from cachetools import TLRUCache, TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from psycopg.rows import dict_row
 
 from app.config import settings
-from app.db import get_supabase_client
+from app.db import get_db_connection
+
+logger = logging.getLogger(__name__)
 
 JWT_SECRET = settings.supabase_jwt_secret or settings.supabase_anon_key
+# Bound once at import so the verification hot path doesn't go through
+# the settings object (or re-encode the HMAC key) on every request
+JWT_SECRET_BYTES = JWT_SECRET.encode()
+JWT_AUDIENCE = settings.jwt_audience
+JWT_ISSUER = settings.jwt_issuer
+JWT_CACHE_TTL = settings.jwt_cache_ttl
 if settings.supabase_jwt_secret is None:
-    import logging
-
-    logging.getLogger(__name__).warning(
+    logger.warning(
         "SUPABASE_JWT_SECRET not set; falling back to anon key. Set SUPABASE_JWT_SECRET for stricter auth validation."
     )
 
+
+def _jwt_cache_ttu(_key: bytes, payload: dict, now: float) -> float:
+    """Expire a cached payload after JWT_CACHE_TTL seconds, or at the token's exp if sooner."""
+    remaining = payload.get("exp", 0) - time.time()
+    return now + min(JWT_CACHE_TTL, remaining)
+
+
+# Verified JWT payloads, keyed by a 16-byte BLAKE2b digest of the raw token
+# (the token itself is never kept in memory). Tokens without an exp claim
+# are never cached.
+_jwt_cache: TLRUCache = TLRUCache(maxsize=settings.jwt_cache_max, ttu=_jwt_cache_ttu)
+_jwt_cache_lock = threading.Lock()
+
 # HTTP Bearer token scheme
 # This automatically extracts the token from the Authorization header
 # Format: Authorization: Bearer <token>
 security = HTTPBearer()
 
 
+def _b64url_json(segment: str):
+    """Decode one base64url JWT segment (padding optional) as JSON."""
+    return orjson.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
+def _prefilter_jwt(token: str) -> str | None:
+    """
+    Find tokens that cannot possibly verify, before doing any HMAC work.
+    
+    Reads the unverified header and payload and checks the algorithm,
+    issuer, audience and expiry. This never accepts a token by itself;
+    jwt.decode still verifies the signature and claims afterwards. It only
+    lets malformed, expired or foreign tokens (scanners, bots) fail cheaply.
+    
+    Returns:
+        The reason the token is rejected, or None if it may be valid
+    """
+    try:
+        header_b64, payload_b64, _ = token.split(".", 2)
+        header = _b64url_json(header_b64)
+        payload = _b64url_json(payload_b64)
+    except ValueError:
+        # Covers a wrong segment count, bad base64 and bad JSON
+        return "Malformed token"
+    
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        return "Malformed token"
+    if header.get("alg") != "HS256":
+        return "The specified alg value is not allowed"
+    if payload.get("iss") != JWT_ISSUER:
+        return "Invalid issuer"
+    
+    audience = payload.get("aud")
+    if isinstance(audience, str):
+        audience = [audience]
+    if not isinstance(audience, list) or JWT_AUDIENCE not in audience:
+        return "Audience doesn't match"
+    
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp < time.time():
+        return "Signature has expired"
+    
+    return None
+
+
 def verify_jwt_token(token: str) -> dict:
     """
     Verify and decode a JWT token.
@@ -68,7 +142,25 @@ def verify_jwt_token(token: str) -> dict:
         The JWT secret is embedded in the Supabase anon key.
         For Supabase, we need to extract it. In production, you might
         use JWK (JSON Web Key) sets for better security.
+
+        Successfully verified payloads are cached for a short time
+        (JWT_CACHE_TTL, bounded by the token's exp), so repeated
+        requests with the same token skip the signature check.
     """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    reason = _prefilter_jwt(token)
+    if reason:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid authentication credentials: {reason}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     try:
         # Decode and verify JWT
         # For Supabase, we use the service role key's secret
@@ -79,12 +171,14 @@ def verify_jwt_token(token: str) -> dict:
         # For proper validation, we should use the JWT secret from Supabase settings
         # But for development, we can verify using the anon key's embedded secret
         
+        # PyJWT verifies HS256 through hmac/OpenSSL, so the HMAC itself
+        # runs on the C (and SHA-NI, where available) path
         payload = jwt.decode(
             token,
-            JWT_SECRET,
+            JWT_SECRET_BYTES,
             algorithms=["HS256"],
-            audience=settings.jwt_audience,
-            issuer=settings.jwt_issuer,
+            audience=JWT_AUDIENCE,
+            issuer=JWT_ISSUER,
             options={
                 # In development, we might need to be less strict
                 # In production, set these to True for security
@@ -92,12 +186,11 @@ def verify_jwt_token(token: str) -> dict:
                 "verify_aud": True,
                 "verify_iss": True,
                 "verify_exp": True,
+                "require": ["exp", "sub"],
             }
         )
         
-        return payload
-        
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         # Token is invalid, expired, or verification failed
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,6 +198,11 @@ def verify_jwt_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
+    with _jwt_cache_lock:
+        _jwt_cache[cache_key] = payload
+
+    return payload
+
 
 async def get_current_user_id(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
@@ -188,6 +286,123 @@ async def get_current_user(
 # API KEY AUTHENTICATION
 # ============================================================================
 
+API_KEY_PREFIX = "jobmail_"
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """
+    Return the SHA-256 digest stored in api_keys.api_key_hash for a key.
+    
+    Keys are looked up by this fixed-size hash rather than the raw key text.
+    """
+    return hashlib.sha256(api_key.encode()).digest()
+
+
+def generate_api_key() -> tuple[str, bytes]:
+    """
+    Create a new random API key.
+    
+    Format: jobmail_<32 random bytes, base64url without padding>
+    
+    Returns:
+        Tuple of (api_key, api_key_hash). Only the hash is stored; the key
+        itself is shown to the user once.
+    """
+    raw = secrets.token_bytes(32)
+    api_key = API_KEY_PREFIX + base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+    # Hashed as text, exactly as validate_api_key hashes the presented header
+    return api_key, hash_api_key(api_key)
+
+
+# Validated API keys as (user_id, expires_at in unix seconds), keyed by the
+# key's hash so the raw key is never kept in memory. Only touched from the
+# event loop, so no lock is needed.
+_api_key_cache: TTLCache = TTLCache(
+    maxsize=settings.api_key_cache_max, ttl=settings.api_key_cache_ttl
+)
+
+
+def invalidate_api_key_cache(api_key_hash: bytes) -> None:
+    """
+    Drop a revoked key from this process's cache.
+    
+    Other workers keep their own copy, so they may still accept the key for
+    up to settings.api_key_cache_ttl seconds.
+    """
+    _api_key_cache.pop(api_key_hash, None)
+
+# Hashes of API keys used since the last flush. Their last_used_at is
+# written in a single UPDATE every _LAST_USED_FLUSH_INTERVAL seconds instead
+# of once per request; a hash stays queued until its UPDATE has run.
+_LAST_USED_FLUSH_INTERVAL = 5.0
+_pending_last_used: set[bytes] = set()
+_last_used_flush_task: asyncio.Task | None = None
+
+
+def _record_api_key_use(api_key_hash: bytes) -> None:
+    """Queue a last_used_at update for the key and make sure a flush is scheduled."""
+    global _last_used_flush_task
+    _pending_last_used.add(api_key_hash)
+    if _last_used_flush_task is None or _last_used_flush_task.done():
+        _last_used_flush_task = asyncio.create_task(_flush_last_used())
+
+
+async def _flush_last_used() -> None:
+    """
+    Write queued last_used_at updates every flush interval until none are left.
+    
+    Keys used while an UPDATE is running are picked up by the next round, so
+    no use is left waiting for a later request to schedule a flush.
+    """
+    while _pending_last_used:
+        await asyncio.sleep(_LAST_USED_FLUSH_INTERVAL)
+        await _write_last_used()
+
+
+async def _write_last_used() -> None:
+    """Write last_used_at for every queued key in one UPDATE."""
+    api_key_hashes = list(_pending_last_used)
+    if not api_key_hashes:
+        return
+
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute(
+                "UPDATE api_keys SET last_used_at = now() WHERE api_key_hash = ANY(%s)",
+                (api_key_hashes,),
+            )
+    except Exception as e:
+        logger.warning("Error updating API key last_used_at: %s", e)
+    _pending_last_used.difference_update(api_key_hashes)
+
+
+async def flush_api_key_last_used() -> None:
+    """
+    Write any queued last_used_at updates now.
+    
+    Called from the app lifespan on shutdown, before the database pool is
+    closed, so uses since the last flush aren't lost.
+    """
+    task = _last_used_flush_task
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await _write_last_used()
+
+
+def _check_api_key_expiry(expires_at: float | None) -> None:
+    """Raise a 401 if the API key's expiry (unix seconds, None = never) has passed."""
+    if expires_at is not None and expires_at < time.time():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API key has expired",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+
+
 async def validate_api_key(api_key: str) -> str:
     """
     Validate an API key and return the associated user ID.
@@ -203,6 +418,14 @@ async def validate_api_key(api_key: str) -> str:
         
     Raises:
         HTTPException: 401 if API key is invalid or expired
+        
+    Note:
+        Successful lookups are cached for settings.api_key_cache_ttl seconds,
+        so cache hits skip the SELECT. Expiry is still checked on every call;
+        revocation only clears the revoking worker's entry, so other workers
+        may accept a revoked key until their cached entry expires.
+        last_used_at is not written inline; uses are queued and flushed in
+        one batched UPDATE a few seconds later.
     """
     if not api_key:
         raise HTTPException(
@@ -211,45 +434,51 @@ async def validate_api_key(api_key: str) -> str:
             headers={"WWW-Authenticate": "ApiKey"},
         )
     
-    supabase = get_supabase_client()
+    api_key_hash = hash_api_key(api_key)
+    cached = _api_key_cache.get(api_key_hash)
+    if cached is not None:
+        user_id, expires_at = cached
+        _check_api_key_expiry(expires_at)
+        _record_api_key_use(api_key_hash)
+        return user_id
     
     try:
-        # Query the API keys table using service role to bypass RLS
-        response = supabase.table("api_keys").select("user_id, expires_at, last_used_at").eq("api_key", api_key).maybe_single().execute()
+        # Query the API keys table directly over async psycopg so the
+        # lookup doesn't block the event loop (this connection bypasses RLS)
+        async with get_db_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    "SELECT user_id::text AS user_id, expires_at FROM api_keys WHERE api_key_hash = %s",
+                    (api_key_hash,),
+                )
+                api_key_data = await cur.fetchone()
         
-        if not response.data:
+        if not api_key_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key",
                 headers={"WWW-Authenticate": "ApiKey"},
             )
         
-        api_key_data = response.data
         user_id = api_key_data.get("user_id")
+        # Kept as unix seconds so every later check is a float comparison
         expires_at = api_key_data.get("expires_at")
+        if expires_at is not None:
+            expires_at = expires_at.timestamp()
         
         # Check if API key has expired
-        if expires_at:
-            from datetime import datetime, timezone
-            expire_time = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-            if expire_time < datetime.now(timezone.utc):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="API key has expired",
-                    headers={"WWW-Authenticate": "ApiKey"},
-                )
+        _check_api_key_expiry(expires_at)
         
-        # Update last_used_at timestamp
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc).isoformat()
-        supabase.table("api_keys").update({"last_used_at": now}).eq("api_key", api_key).execute()
+        # Update last_used_at timestamp (batched, off the request path)
+        _record_api_key_use(api_key_hash)
         
+        _api_key_cache[api_key_hash] = (user_id, expires_at)
         return user_id
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error validating API key: {e}")
+        logger.warning("Error validating API key: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
@@ -257,37 +486,7 @@ async def validate_api_key(api_key: str) -> str:
         )
 
 
-async def get_user_id_from_api_key(
-    x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None
-) -> str | None:
-    """
-    Extract and validate API key from X-API-Key header.
-    
-    This is used as a dependency to support API key authentication.
-    Returns None if no API key is provided (fallback to JWT).
-    
-    Args:
-        x_api_key: API key from X-API-Key header
-        
-    Returns:
-        User ID if API key is valid, None otherwise
-    """
-    if not x_api_key:
-        return None
-    
-    try:
-        return await validate_api_key(x_api_key)
-    except HTTPException:
-        # Re-raise auth errors
-        raise
-
-
-async def get_current_user_id_flexible(
-    # Try API key first (from header)
-    api_key_user_id: Annotated[str | None, Depends(get_user_id_from_api_key)] = None,
-    # Fallback to JWT (from Authorization header)
-    jwt_credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(HTTPBearer(auto_error=False))] = None,
-) -> str:
+async def get_current_user_id_flexible(request: Request) -> str:
     """
     Unified authentication dependency that supports both API keys and JWT tokens.
     
@@ -298,9 +497,12 @@ async def get_current_user_id_flexible(
     This allows endpoints to accept either authentication method,
     making it easy to migrate from JWT to API keys.
     
+    Both headers are read directly from the request in a single dependency,
+    so only the method actually used does any work (no separate API-key and
+    HTTPBearer dependencies resolved on every request).
+    
     Args:
-        api_key_user_id: User ID from API key (if provided)
-        jwt_credentials: JWT credentials from Authorization header (if provided)
+        request: Incoming request (headers are read directly)
         
     Returns:
         User ID (UUID as string)
@@ -309,15 +511,19 @@ async def get_current_user_id_flexible(
         HTTPException: 401 if neither authentication method is valid
     """
     # Try API key first
-    if api_key_user_id:
-        return api_key_user_id
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        return await validate_api_key(api_key)
     
     # Fallback to JWT
-    if jwt_credentials:
-        payload = verify_jwt_token(jwt_credentials.credentials)
-        user_id = payload.get("sub")
-        if user_id:
-            return user_id
+    authorization = request.headers.get("authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = verify_jwt_token(token)
+            user_id = payload.get("sub")
+            if user_id:
+                return user_id
     
     # Neither method provided or both failed
     raise HTTPException(
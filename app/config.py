@@ -50,6 +50,22 @@ class Settings(BaseSettings):
         ...,
         description="PostgreSQL connection string for direct database access"
     )
+    db_pool_min_size: int = Field(
+        default=5,
+        description="Connections the async PostgreSQL pool keeps open"
+    )
+    db_pool_max_size: int = Field(
+        default=20,
+        description="Maximum connections the async PostgreSQL pool may open"
+    )
+    db_pool_max_idle: float = Field(
+        default=300.0,
+        description="Seconds an idle pooled PostgreSQL connection is kept before being closed (down to the minimum size)"
+    )
+    supabase_http_max_connections: int = Field(
+        default=100,
+        description="Maximum (and kept-alive) HTTP connections the shared Supabase client holds open"
+    )
     
     # JWT Configuration
     # These settings are used to validate JWT tokens from Supabase Auth
@@ -61,6 +77,22 @@ class Settings(BaseSettings):
         ...,
         description="Expected JWT issuer (your Supabase auth URL)"
     )
+    jwt_cache_ttl: int = Field(
+        default=30,
+        description="Seconds a verified JWT payload stays cached (never beyond the token's own exp)"
+    )
+    jwt_cache_max: int = Field(
+        default=10_000,
+        description="Maximum number of verified JWT payloads kept in the in-process cache"
+    )
+    api_key_cache_ttl: int = Field(
+        default=15,
+        description="Seconds a validated API key stays cached before it is looked up again (and so how long a revoked key may still work in other workers)"
+    )
+    api_key_cache_max: int = Field(
+        default=5_000,
+        description="Maximum number of validated API keys kept in the in-process cache"
+    )
     
     # Application Settings
     environment: str = Field(
@@ -71,6 +103,38 @@ class Settings(BaseSettings):
         default="INFO",
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
     )
+    analytics_cache_ttl: int = Field(
+        default=60,
+        description="Seconds per-user analytics results are reused before being recomputed"
+    )
+    analytics_cache_max: int = Field(
+        default=5_000,
+        description="Maximum number of users whose analytics results are kept in memory"
+    )
+    feature_access_cache_ttl: int = Field(
+        default=30,
+        description="Seconds a subscription feature check (allowed or denied) is reused"
+    )
+    feature_access_cache_max: int = Field(
+        default=10_000,
+        description="Maximum number of (user, feature) access results kept in memory"
+    )
+    subscription_cache_ttl: int = Field(
+        default=10,
+        description="Seconds a user's subscription is reused before being read again (dropped on any change, but only in the worker that made it)"
+    )
+    plans_cache_ttl: int = Field(
+        default=3600,
+        description="Seconds subscription plan definitions are reused before being read again"
+    )
+    profile_exists_cache_ttl: int = Field(
+        default=300,
+        description="Seconds a user's profile is remembered to exist before email ingestion checks again"
+    )
+    profile_exists_cache_max: int = Field(
+        default=10_000,
+        description="Maximum number of users remembered as having a profile"
+    )
     
     # CORS Settings
     # Cross-Origin Resource Sharing - which frontend URLs can access the API
@@ -12,18 +12,32 @@ Why both?
 - Direct PostgreSQL: Needed for migrations, bulk operations, and bypassing RLS
 """
 
+import threading
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+import httpx
 import psycopg
-from supabase import Client, create_client
+from psycopg_pool import AsyncConnectionPool
+from supabase import Client, ClientOptions, create_client
 
 from app.config import settings
 
+# Connection arguments resolved once at import
+_SUPABASE_URL = settings.supabase_url
+_SUPABASE_SERVICE_ROLE_KEY = settings.supabase_service_role_key
+
+# Shared Supabase client, created lazily on first use
+_supabase_client: Client | None = None
+_supabase_client_lock = threading.Lock()
+
+# Shared async PostgreSQL pool, opened by the app lifespan (or on first use)
+_db_pool: AsyncConnectionPool | None = None
+
 
 def get_supabase_client() -> Client:
     """
-    Create a Supabase client instance.
+    Return the shared Supabase client instance.
     
     The Supabase client provides:
     - Automatic JWT handling
@@ -34,6 +48,13 @@ def get_supabase_client() -> Client:
     This uses the service role key to bypass RLS for backend operations.
     For user-specific operations, you'd typically use the anon key with a user JWT.
     
+    The client is created once and reused, so requests don't pay for a new
+    HTTP session (and TLS handshake) on every call. It is given its own
+    httpx client whose keep-alive pool is as large as its connection limit,
+    so connections opened under concurrent load (supabase-py calls run in
+    worker threads) stay open for reuse instead of being closed after each
+    request. The app lifespan creates it at startup.
+    
     Returns:
         Client: Configured Supabase client
         
@@ -41,12 +62,65 @@ def get_supabase_client() -> Client:
         >>> supabase = get_supabase_client()
         >>> response = supabase.table("applications").select("*").execute()
     """
-    return create_client(
-        supabase_url=settings.supabase_url,
-        # Using service role key for backend operations
-        # This bypasses Row-Level Security policies
-        supabase_key=settings.supabase_service_role_key,
-    )
+    global _supabase_client
+    if _supabase_client is None:
+        with _supabase_client_lock:
+            if _supabase_client is None:
+                http_client = httpx.Client(
+                    # Same timeout, redirect and HTTP/2 behaviour as the
+                    # client supabase-py would otherwise build for PostgREST
+                    timeout=httpx.Timeout(120.0),
+                    follow_redirects=True,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=settings.supabase_http_max_connections,
+                        max_keepalive_connections=settings.supabase_http_max_connections,
+                        keepalive_expiry=30.0,
+                    ),
+                )
+                _supabase_client = create_client(
+                    supabase_url=_SUPABASE_URL,
+                    # Using service role key for backend operations
+                    # This bypasses Row-Level Security policies
+                    supabase_key=_SUPABASE_SERVICE_ROLE_KEY,
+                    options=ClientOptions(httpx_client=http_client),
+                )
+    return _supabase_client
+
+
+def _get_db_pool() -> AsyncConnectionPool:
+    """Return the shared async connection pool, creating it (closed) if needed."""
+    global _db_pool
+    if _db_pool is None:
+        _db_pool = AsyncConnectionPool(
+            conninfo=settings.database_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            max_idle=settings.db_pool_max_idle,
+            # Test each connection as it's handed out, so one the server or
+            # a network hop dropped while idle is replaced, not returned
+            check=AsyncConnectionPool.check_connection,
+            kwargs={
+                "autocommit": False,
+                # Prepare every statement server-side on first use so repeated
+                # queries skip parsing/planning. Requires a direct (session)
+                # connection, not a transaction-mode pooler.
+                "prepare_threshold": 0,
+            },
+            open=False,
+        )
+    return _db_pool
+
+
+async def open_db_pool() -> None:
+    """Open the async PostgreSQL pool. Called from the app lifespan on startup."""
+    await _get_db_pool().open()
+
+
+async def close_db_pool() -> None:
+    """Close the async PostgreSQL pool. Called from the app lifespan on shutdown."""
+    if _db_pool is not None:
+        await _db_pool.close()
 
 
 @asynccontextmanager
@@ -59,7 +133,10 @@ async def get_db_connection() -> AsyncGenerator[psycopg.AsyncConnection, None]:
     - Bulk operations
     - Complex queries that need direct SQL
     
-    The connection is automatically closed when the context exits.
+    Connections are borrowed from a shared pool, so callers don't pay the
+    TCP/TLS/auth handshake per request. The connection is returned to the
+    pool when the context exits; the pool commits the transaction on success
+    and rolls it back if an exception escaped.
     
     Yields:
         AsyncConnection: PostgreSQL connection
@@ -70,19 +147,13 @@ async def get_db_connection() -> AsyncGenerator[psycopg.AsyncConnection, None]:
         ...         await cur.execute("SELECT * FROM applications")
         ...         results = await cur.fetchall()
     """
-    # Create async connection to PostgreSQL
-    conn = await psycopg.AsyncConnection.connect(
-        conninfo=settings.database_url,
-        # Auto-commit mode for simple operations
-        autocommit=False,
-    )
+    pool = _get_db_pool()
+    if pool.closed:
+        # Entry points that don't run the app lifespan open the pool lazily
+        await pool.open()
     
-    try:
-        # Yield connection to caller
+    async with pool.connection() as conn:
         yield conn
-    finally:
-        # Always close connection, even if an error occurred
-        await conn.close()
 
 
 def get_sync_db_connection() -> psycopg.Connection:
@@ -15,37 +15,56 @@ Benefits:
 - Clean code - keeps route handlers focused on business logic
 """
 
+import functools
+from datetime import date
 from typing import Annotated, Callable
 
-from fastapi import Depends, Query, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Query, HTTPException, Request, status
+from pydantic import BaseModel, ConfigDict, Field
 
-from app.auth import get_current_user_id, get_current_user_id_flexible
+# Re-export auth dependencies for convenience (defined once, in app.auth)
+# CurrentUserId: JWT only; FlexibleUserId: API key OR JWT
+from app.auth import CurrentUserId, FlexibleUserId, verify_jwt_token
+from app.schemas import ApplicationStatusValue
+from app.services.subscription import get_subscription_service
 
-# Re-export auth dependencies for convenience
-CurrentUserId = Annotated[str, Depends(get_current_user_id)]  # JWT only
-FlexibleUserId = Annotated[str, Depends(get_current_user_id_flexible)]  # API key OR JWT
+# Resolved once at import instead of on every feature-gated request
+_SUBSCRIPTION_SERVICE = get_subscription_service()
 
-# HTTP Bearer token scheme for extracting raw token
-_token_security = HTTPBearer()
 
-
-async def get_current_user_token(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(_token_security)]
-) -> str:
+async def get_current_user_token(request: Request) -> str:
     """
     Extract the raw access token from the Authorization header.
     
     This is useful for endpoints that need to return the token,
     such as for Gmail add-on integration.
     
+    The header is read directly rather than through HTTPBearer, which
+    would build an HTTPAuthorizationCredentials model per request only
+    for us to take the token string back out of it.
+    
+    The token is verified before it is handed back, through
+    verify_jwt_token's payload cache, so repeat calls with the same
+    token cost a dictionary lookup rather than an HS256 check.
+    
     Args:
-        credentials: Automatically extracted from Authorization header
+        request: Incoming request (the header is read directly)
         
     Returns:
         The raw JWT token string
+        
+    Raises:
+        HTTPException: 401 if there is no Bearer token or it fails verification
     """
-    return credentials.credentials
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    verify_jwt_token(token)
+    return token
 
 
 # Common Query Parameters
@@ -80,62 +99,73 @@ class PaginationParams:
         self.limit = limit
 
 
-class FilterParams:
+class FilterParams(BaseModel):
     """
     Reusable filter parameters for applications.
+    
+    Declared as a query parameter model, so FastAPI validates all filters
+    in a single Pydantic call instead of one validator per parameter:
+    
+    @router.get("/items")
+    async def list_items(filters: Annotated[FilterParams, Query()]):
+        ...
     """
 
-    def __init__(
-        self,
-        status: Annotated[
-            str | None,
-            Query(description="Filter by application status")
-        ] = None,
-        company: Annotated[
-            str | None,
-            Query(description="Filter by company name (partial match)")
-        ] = None,
-        position: Annotated[
-            str | None,
-            Query(description="Filter by position title (partial match)")
-        ] = None,
-        source: Annotated[
-            str | None,
-            Query(description="Filter by application source")
-        ] = None,
-        confidence: Annotated[
-            str | None,
-            Query(description="Filter by confidence level")
-        ] = None,
-        date_from: Annotated[
-            str | None,
-            Query(description="Filter applications applied on/after this date (ISO format)")
-        ] = None,
-        date_to: Annotated[
-            str | None,
-            Query(description="Filter applications applied on/before this date (ISO format)")
-        ] = None,
-        search: Annotated[
-            str | None,
-            Query(description="Search company or position")
-        ] = None,
-        sort: Annotated[
-            str | None,
-            Query(
-                description="Sort order (updated_desc or applied_desc)",
-                pattern="^(updated_desc|applied_desc)$"
-            )
-        ] = None,
-    ):
-        self.status = status
-        self.company = company
-        self.position = position
-        self.source = source
-        self.confidence = confidence
-        self.date_from = date_from
-        self.date_to = date_to
-        self.search = search
-        self.sort = sort
+    model_config = ConfigDict(extra="ignore")
+
+    status: ApplicationStatusValue | None = Field(
+        default=None, description="Filter by application status"
+    )
+    company: str | None = Field(
+        default=None, description="Filter by company name (partial match)"
+    )
+    position: str | None = Field(
+        default=None, description="Filter by position title (partial match)"
+    )
+    source: str | None = Field(
+        default=None, description="Filter by application source"
+    )
+    confidence: str | None = Field(
+        default=None, description="Filter by confidence level"
+    )
+    date_from: date | None = Field(
+        default=None, description="Filter applications applied on/after this date (ISO format)"
+    )
+    date_to: date | None = Field(
+        default=None, description="Filter applications applied on/before this date (ISO format)"
+    )
+    search: str | None = Field(
+        default=None, description="Search company or position"
+    )
+    sort: str | None = Field(
+        default=None,
+        description="Sort order (updated_desc or applied_desc)",
+        pattern="^(updated_desc|applied_desc)$",
+    )
+
+
+class PaginatedFilterParams(FilterParams):
+    """
+    FilterParams plus skip/limit, for list endpoints.
+    
+    FastAPI only expands a query parameter model into individual query
+    parameters (in validation and in the OpenAPI docs) when it is the
+    endpoint's only query parameter, so pagination lives on the same model
+    rather than in a separate PaginationParams dependency.
+    """
+
+    skip: int = Field(
+        default=0, ge=0, description="Number of items to skip (slow for large offsets; prefer cursor)"
+    )
+    limit: int = Field(default=20, ge=1, le=100, description="Max items to return")
+    cursor: str | None = Field(
+        default=None,
+        description="Keyset pagination cursor from next_cursor (pass it empty to start at the first page)",
+    )
+    with_total: bool = Field(
+        default=False,
+        description="Return an exact total (runs a full COUNT); otherwise total is the planner's estimate",
+    )
 
 
 # Dependency examples for future use:
@@ -181,6 +211,7 @@ async def require_admin():
     pass
 
 
+@functools.cache
 def require_feature(feature_name: str):
     """
     Dependency factory that requires a specific subscription feature.
@@ -204,12 +235,16 @@ def require_feature(feature_name: str):
         
     Returns:
         Dependency that checks authentication and feature access
+        
+    Note:
+        The factory is memoized, so every require_feature("x") is the same
+        dependency object and FastAPI resolves it once per request even
+        when several dependencies ask for the same feature.
+        
+        Access results are cached by SubscriptionService.check_feature_access.
     """
     async def feature_checker(user_id: CurrentUserId):
-        from app.services.subscription import get_subscription_service
-        
-        subscription_service = get_subscription_service()
-        has_access = await subscription_service.check_feature_access(user_id, feature_name)
+        has_access = await _SUBSCRIPTION_SERVICE.check_feature_access(user_id, feature_name)
         
         if not has_access:
             raise HTTPException(
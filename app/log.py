@@ -0,0 +1,65 @@
+"""
+Logging Setup
+
+Routes the root logger through a queue so log calls never block the event loop.
+
+Why a queue?
+- A StreamHandler writes to stderr synchronously; when stderr is a pipe
+  (Docker, Cloud Run) that write can block the request being served
+- With a QueueHandler, a log call only enqueues the LogRecord
+- A QueueListener thread does the formatting and the actual write
+"""
+
+import logging
+import logging.handlers
+import queue
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def configure_logging(level: str = "INFO") -> bool:
+    """
+    Install a QueueHandler on the root logger and start its listener thread.
+
+    Safe to call more than once: if queue logging is already running
+    (e.g. the app.py entry point set it up first), nothing is changed.
+
+    Args:
+        level: Root log level name (DEBUG, INFO, WARNING, ...)
+
+    Returns:
+        True if this call set logging up (the caller should then call
+        shutdown_logging() on exit), False if it was already running.
+    """
+    global _listener
+    if _listener is not None:
+        return False
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+    _listener.start()
+    return True
+
+
+def shutdown_logging() -> None:
+    """Flush pending records, stop the listener thread and detach the queue."""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    root = logging.getLogger()
+    root.handlers[:] = [
+        handler for handler in root.handlers
+        if not isinstance(handler, logging.handlers.QueueHandler)
+    ]
+    _listener = None
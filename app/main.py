@@ -4,27 +4,43 @@ JobMail FastAPI Application
 Main entry point for the TrackMail backend API.
 """
 
+import logging
 from contextlib import asynccontextmanager
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth import flush_api_key_last_used
 from app.config import settings
+from app.db import close_db_pool, get_supabase_client, open_db_pool
+from app.log import configure_logging, shutdown_logging
+from app.responses import ORJSONResponse
 from app.routers import applications, events, ingest, health, profiles, auth, subscription
 
 
+logger = logging.getLogger(__name__)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: D401
     """Manage application startup and shutdown."""
-    print(f"ðŸš€ JobMail API starting in {settings.environment} mode")
-    print("ðŸ“ Docs available at /docs")
+    started_logging = configure_logging(settings.log_level)
+    logger.info("JobMail API starting in %s mode", settings.environment)
+    logger.info("Docs available at /docs")
+    await open_db_pool()
+    # Create the shared Supabase client now rather than on the first request
+    get_supabase_client()
     try:
         yield
     finally:
-        print("ðŸ‘‹ JobMail API shutting down")
+        await flush_api_key_last_used()
+        await close_db_pool()
+        logger.info("JobMail API shutting down")
+        if started_logging:
+            shutdown_logging()
 
 
 app = FastAPI(
@@ -33,48 +49,129 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.get_cors_origins_list(),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Cache-Control rules for GET responses, checked in order against the raw
+# request path: (path prefix, header value, only when there is a query string).
+# Auth endpoints have no rule, so they are never cached.
+_CACHE_RULES = (
+    # Cache subscription status for 5 minutes
+    (b"/v1/subscription/status", b"private, max-age=300", False),
+    # Cache health checks for 30 seconds
+    (b"/health", b"public, max-age=30", False),
+    (b"/v1/health", b"public, max-age=30", False),
+    # Cache filtered application lists for 1 minute
+    (b"/v1/applications", b"private, max-age=60", True),
+)
+_SECURITY_HEADERS = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
 )
 
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
-    """Add cache headers to GET requests for better performance."""
+class CacheControlMiddleware:
+    """
+    Add cache headers to GET requests for better performance.
     
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
+    Written as a plain ASGI middleware that only rewrites the
+    http.response.start message; BaseHTTPMiddleware would spawn a task
+    and a memory stream for every request. Rules are matched on the raw
+    path bytes against the prefix table above, and all header values are
+    pre-encoded, so no Request/URL objects are built per response.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Add cache headers for GET requests (except auth endpoints)
-        if request.method == "GET" and not request.url.path.startswith("/v1/auth"):
-            # Cache subscription status for 5 minutes
-            if "/subscription/status" in request.url.path:
-                response.headers["Cache-Control"] = "private, max-age=300"
-            # Cache health checks for 30 seconds
-            elif "/health" in request.url.path:
-                response.headers["Cache-Control"] = "public, max-age=30"
-            # Cache application lists for 1 minute
-            elif "/applications" in request.url.path and "?" in str(request.url):
-                response.headers["Cache-Control"] = "private, max-age=60"
+        extra_headers = _SECURITY_HEADERS
+        if scope["method"] == "GET":
+            path = scope.get("raw_path") or scope["path"].encode()
+            has_query = bool(scope["query_string"])
+            for prefix, cache_control, needs_query in _CACHE_RULES:
+                if path.startswith(prefix) and (has_query or not needs_query):
+                    extra_headers = ((b"cache-control", cache_control), *_SECURITY_HEADERS)
+                    break
         
-        # Add performance headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
+
 
+# Basic API information served at /
+_ROOT_RESPONSE = {
+    "name": "JobMail API",
+    "version": "0.1.0",
+    "docs": "/docs",
+    "health": "/health",
+}
 
+
+class StaticResponseMiddleware:
+    """
+    Answer GET requests for constant endpoints without going through the router.
+    
+    / and the health checks are what load balancers and probes hit most;
+    their bodies never change, so each is encoded once and sent directly.
+    The health router is only mounted under /v1, so this also keeps the
+    legacy /health path.
+    """
+    
+    def __init__(self, app: ASGIApp, responses: dict[str, dict]):
+        self.app = app
+        self.responses: dict[str, tuple[list[tuple[bytes, bytes]], bytes]] = {}
+        for path, content in responses.items():
+            body = orjson.dumps(content)
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            self.responses[path] = (headers, body)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["method"] == "GET":
+            response = self.responses.get(scope["path"])
+            if response is not None:
+                headers, body = response
+                await send({"type": "http.response.start", "status": 200, "headers": list(headers)})
+                await send({"type": "http.response.body", "body": body})
+                return
+        await self.app(scope, receive, send)
+
+
+# Added first so it runs innermost: CORS and cache/security headers still apply
+app.add_middleware(
+    StaticResponseMiddleware,
+    responses={
+        "/": _ROOT_RESPONSE,
+        "/health": health.HEALTH_STATUS,
+        "/v1/health": health.HEALTH_STATUS,
+    },
+)
+app.add_middleware(
+    CORSMiddleware,
+    # A frozenset makes CORSMiddleware's per-request `origin in allow_origins`
+    # check a hash lookup instead of a scan of the configured list
+    allow_origins=frozenset(settings.get_cors_origins_list()),
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    # Pagination headers set by GET /v1/applications
+    expose_headers=["Link", "X-Next-Cursor"],
+)
 app.add_middleware(CacheControlMiddleware)
 
 
-app.include_router(health.router, tags=["Health"])
 app.include_router(health.router, prefix="/v1", tags=["Health"])
 app.include_router(auth.router, prefix="/v1", tags=["Auth"])
 app.include_router(applications.router, prefix="/v1", tags=["Applications"])
@@ -86,10 +183,5 @@ app.include_router(subscription.router, prefix="/v1", tags=["Subscription"])
 
 @app.get("/")
 async def root() -> dict[str, str]:
-    """Return basic API information."""
-    return {
-        "name": "JobMail API",
-        "version": "0.1.0",
-        "docs": "/docs",
-        "health": "/health",
-    }
+    """Return basic API information (normally answered by StaticResponseMiddleware)."""
+    return _ROOT_RESPONSE
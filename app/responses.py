@@ -0,0 +1,26 @@
+"""
+Response Classes
+
+Custom response classes shared by the API.
+
+FastAPI's own ORJSONResponse is deprecated in recent releases, so the
+orjson-backed response lives here instead.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson instead of the stdlib json module.
+    
+    orjson is a compiled encoder, several times faster than json.dumps on
+    large list-of-dict payloads such as paginated application lists, and
+    it handles datetime/UUID values natively.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
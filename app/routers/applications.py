@@ -1,4 +1,4 @@
-"""
+﻿"""
 Applications Router
 
 This router handles all job application CRUD operations:
@@ -12,14 +12,19 @@ All endpoints require authentication via JWT token.
 Row-Level Security ensures users only access their own data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
 
-from app.deps import CurrentUserId, FilterParams, PaginationParams, require_feature
+from app.deps import CurrentUserId, FilterParams, PaginatedFilterParams, require_feature
+from app.responses import ORJSONResponse
 from app.schemas import (
     ApplicationCreate,
     ApplicationResponse,
     ApplicationUpdate,
+    BulkUpdateItem,
     PaginatedResponse,
 )
 from app.services import applications as app_service
@@ -29,12 +34,22 @@ from app.services import applications as app_service
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
-@router.get("/", response_model=PaginatedResponse)
+def _next_page_headers(request: Request, **next_params) -> dict[str, str]:
+    """Build the RFC 8288 Link header pointing at the next page of this request."""
+    next_url = request.url.include_query_params(**next_params)
+    return {"Link": f'<{next_url}>; rel="next"'}
+
+
+# response_model=None and a Response returned directly: the rows come from
+# our own database, so the page goes straight to orjson without per-item
+# validation or a jsonable_encoder walk; `responses` keeps the schema in
+# the OpenAPI docs
+@router.get("/", response_model=None, responses={200: {"model": PaginatedResponse}})
 async def list_applications(
+    request: Request,
     user_id: CurrentUserId,
-    pagination: PaginationParams = Depends(),
-    filters: FilterParams = Depends(),
-) -> PaginatedResponse:
+    filters: Annotated[PaginatedFilterParams, Query()],
+) -> ORJSONResponse:
     """
     List all applications for the authenticated user.
     
@@ -46,11 +61,20 @@ async def list_applications(
     Supports pagination:
     - skip: Number of items to skip (default 0)
     - limit: Maximum items to return (default 20, max 100)
+    - with_total: Count the exact total. Without it, total is Postgres'
+      row estimate, which avoids a COUNT(*) over all matching rows.
+    - cursor: Keyset pagination instead of skip. Pass an empty cursor for
+      the first page, then each response's next_cursor; pages are ordered
+      newest first and cost the same however deep they are. total is not
+      counted in this mode (it is null); use has_more instead.
+    
+    When another page follows, its URL is also sent in a `Link: <...>;
+    rel="next"` header (and, in cursor mode, the cursor in X-Next-Cursor),
+    so clients can page without reading the body's metadata.
     
     Args:
         user_id: Automatically extracted from JWT token
-        pagination: Pagination parameters from query string
-        filters: Filter parameters from query string
+        filters: Filter and pagination parameters from query string
         
     Returns:
         Paginated list of applications
@@ -58,11 +82,7 @@ async def list_applications(
     Example Request:
         GET /applications?status=applied&company=acme&skip=0&limit=10
     """
-    # Get applications from service layer
-    applications, total = await app_service.get_user_applications(
-        user_id=user_id,
-        skip=pagination.skip,
-        limit=pagination.limit,
+    filter_kwargs = dict(
         status=filters.status,
         company=filters.company,
         position=filters.position,
@@ -71,22 +91,63 @@ async def list_applications(
         date_from=filters.date_from,
         date_to=filters.date_to,
         search=filters.search,
-        sort=filters.sort,
     )
     
-    return PaginatedResponse(
-        items=applications,
-        total=total,
-        skip=pagination.skip,
-        limit=pagination.limit,
+    if filters.cursor is not None:
+        # Keyset mode: no skip and no COUNT(*), just "is there more?"
+        applications, next_cursor = await app_service.get_user_applications_page(
+            user_id=user_id,
+            cursor=filters.cursor,
+            limit=filters.limit,
+            **filter_kwargs,
+        )
+        headers = None
+        if next_cursor is not None:
+            headers = _next_page_headers(request, cursor=next_cursor)
+            headers["X-Next-Cursor"] = next_cursor
+        return ORJSONResponse({
+            "items": applications,
+            "total": None,
+            "skip": 0,
+            "limit": filters.limit,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }, headers=headers)
+    
+    # Get applications from service layer. One extra row is fetched so
+    # has_more doesn't depend on the total, which is only an estimate
+    # unless with_total is set
+    applications, total = await app_service.get_user_applications(
+        user_id=user_id,
+        skip=filters.skip,
+        limit=filters.limit + 1,
+        sort=filters.sort,
+        count="exact" if filters.with_total else "planned",
+        **filter_kwargs,
     )
-
-
+    
+    has_more = len(applications) > filters.limit
+    headers = None
+    if has_more:
+        headers = _next_page_headers(request, skip=filters.skip + filters.limit)
+    return ORJSONResponse({
+        "items": applications[:filters.limit],
+        "total": total,
+        "skip": filters.skip,
+        "limit": filters.limit,
+        "next_cursor": None,
+        "has_more": has_more,
+    }, headers=headers)
+
+
+# Single-item handlers return the service's dict as-is: response_model
+# validates and serializes it exactly once, instead of building an
+# ApplicationResponse here and having FastAPI dump and re-validate it
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
     data: ApplicationCreate,
     user_id: CurrentUserId,
-) -> ApplicationResponse:
+) -> dict:
     """
     Create a new job application.
     
@@ -121,7 +182,7 @@ async def create_application(
     # Create application via service layer
     application = await app_service.create_application(user_id=user_id, data=data)
     
-    return ApplicationResponse(**application)
+    return application
 
 
 @router.get("/status-groups")
@@ -132,15 +193,15 @@ async def applications_by_status(user_id: CurrentUserId) -> dict[str, list[dict]
 
 @router.get("/export")
 async def export_applications(
+    filters: Annotated[FilterParams, Query()],
     user_id: str = Depends(require_feature("export_data")),
-    filters: FilterParams = Depends(),
 ) -> StreamingResponse:
     """
     Export applications as CSV respecting current filters.
     
     Requires Pro subscription with export_data feature.
     """
-    csv_data = await app_service.export_applications_to_csv(
+    csv_chunks = app_service.iter_applications_csv(
         user_id=user_id,
         status=filters.status,
         company=filters.company,
@@ -150,10 +211,9 @@ async def export_applications(
         date_from=filters.date_from,
         date_to=filters.date_to,
         search=filters.search,
-        sort=filters.sort,
     )
     return StreamingResponse(
-        iter([csv_data]),
+        csv_chunks,
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=applications.csv"}
     )
@@ -161,7 +221,7 @@ async def export_applications(
 
 
 
-@router.get("/analytics/overview")
+@router.get("/analytics/overview", response_model=None)
 async def get_analytics_overview(
     user_id: str = Depends(require_feature("advanced_analytics"))
 ) -> dict:
@@ -173,10 +233,10 @@ async def get_analytics_overview(
     return await app_service.get_analytics_overview(user_id)
 
 
-@router.get("/analytics/trends")
+@router.get("/analytics/trends", response_model=None)
 async def get_analytics_trends(
     user_id: str = Depends(require_feature("advanced_analytics")),
-    days: int = 30
+    days: Annotated[int, Query(ge=1, le=365)] = 30,
 ) -> dict:
     """
     Get application trends over time.
@@ -186,7 +246,7 @@ async def get_analytics_trends(
     return await app_service.get_analytics_trends(user_id, days)
 
 
-@router.get("/analytics/companies")
+@router.get("/analytics/companies", response_model=None)
 async def get_analytics_companies(
     user_id: str = Depends(require_feature("advanced_analytics"))
 ) -> dict:
@@ -198,7 +258,7 @@ async def get_analytics_companies(
     return await app_service.get_analytics_companies(user_id)
 
 
-@router.get("/analytics/sources")
+@router.get("/analytics/sources", response_model=None)
 async def get_analytics_sources(
     user_id: str = Depends(require_feature("advanced_analytics"))
 ) -> dict:
@@ -210,11 +270,14 @@ async def get_analytics_sources(
     return await app_service.get_analytics_sources(user_id)
 
 
-@router.get("/{application_id}", response_model=ApplicationResponse)
+# Item routes only match UUID paths, so static routes such as /export or
+# /analytics/* can never be captured by them, whatever order they're in,
+# and malformed IDs 404 in the router without reaching the database
+@router.get("/{application_id:uuid}", response_model=ApplicationResponse)
 async def get_application(
-    application_id: str,
+    application_id: UUID,
     user_id: CurrentUserId,
-) -> ApplicationResponse:
+) -> dict:
     """
     Get a single application by ID.
     
@@ -231,7 +294,7 @@ async def get_application(
         404: Application not found or user doesn't have access
     """
     application = await app_service.get_application_by_id(
-        application_id=application_id,
+        application_id=str(application_id),
         user_id=user_id
     )
     
@@ -241,15 +304,15 @@ async def get_application(
             detail="Application not found"
         )
     
-    return ApplicationResponse(**application)
+    return application
 
 
-@router.patch("/{application_id}", response_model=ApplicationResponse)
+@router.patch("/{application_id:uuid}", response_model=ApplicationResponse)
 async def update_application(
-    application_id: str,
+    application_id: UUID,
     data: ApplicationUpdate,
     user_id: CurrentUserId,
-) -> ApplicationResponse:
+) -> dict:
     """
     Update an application.
     
@@ -275,7 +338,7 @@ async def update_application(
         }
     """
     application = await app_service.update_application(
-        application_id=application_id,
+        application_id=str(application_id),
         user_id=user_id,
         data=data
     )
@@ -286,12 +349,12 @@ async def update_application(
             detail="Application not found"
         )
     
-    return ApplicationResponse(**application)
+    return application
 
 
-@router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{application_id:uuid}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_application(
-    application_id: str,
+    application_id: UUID,
     user_id: CurrentUserId,
 ) -> None:
     """
@@ -310,7 +373,7 @@ async def delete_application(
         404: Application not found or user doesn't have access
     """
     success = await app_service.delete_application(
-        application_id=application_id,
+        application_id=str(application_id),
         user_id=user_id
     )
     
@@ -323,12 +386,12 @@ async def delete_application(
 
 @router.put("/bulk-update", response_model=list[ApplicationResponse])
 async def bulk_update_applications(
-    updates: list[dict],
+    updates: list[BulkUpdateItem],
     user_id: CurrentUserId,
-) -> list[ApplicationResponse]:
+) -> list[dict]:
     """Bulk update applications (used for drag-and-drop reorder)."""
     result = await app_service.bulk_update_applications(user_id=user_id, updates=updates)
-    return [ApplicationResponse(**record) for record in result]
+    return result
 
 
 
@@ -4,20 +4,39 @@ Auth Router
 Provides authentication-related endpoints, including token retrieval and API key management for Gmail add-on integration.
 """
 
-import secrets
+import logging
 from typing import Annotated
 from datetime import datetime, timedelta, timezone
 
+import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
-from jose import jwt
 from pydantic import BaseModel
 
+from app.auth import (
+    JWT_AUDIENCE,
+    JWT_ISSUER,
+    JWT_SECRET_BYTES,
+    generate_api_key,
+    invalidate_api_key_cache,
+)
 from app.deps import get_current_user_token, CurrentUserId
-from app.config import settings
 from app.db import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Claims shared by every installation token; copied per request and
+# completed with the user's own claims
+_INSTALLATION_TOKEN_CLAIMS = {
+    "type": "installation",
+    "aud": JWT_AUDIENCE,
+    "iss": JWT_ISSUER,
+    "role": "authenticated",
+    "app_metadata": {"provider": "installation_token"},
+}
+_INSTALLATION_TOKEN_LIFETIME = timedelta(days=365)
+
 
 class ApiKeyResponse(BaseModel):
     """Response model for API key creation."""
@@ -65,8 +84,8 @@ async def issue_installation_token(user_id: CurrentUserId) -> dict[str, str]:
     try:
         user_response = supabase.auth.admin.get_user_by_id(user_id)
         user = user_response.user
-    except Exception as exc:  # pragma: no cover - log for observability
-        print(f"⚠️ Failed to fetch user info for installation token: {exc}")
+    except Exception:  # pragma: no cover - log for observability
+        logger.exception("Failed to fetch user info for installation token")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch user information for installation token",
@@ -78,29 +97,23 @@ async def issue_installation_token(user_id: CurrentUserId) -> dict[str, str]:
             detail="User not found",
         )
 
-    email: str | None = getattr(user, "email", None)
-    user_metadata = getattr(user, "user_metadata", None) or {}
+    # supabase_auth's User model always defines both fields
+    email: str | None = user.email
+    user_metadata = user.user_metadata or {}
 
+    # 365 days expiration
+    now = datetime.now(timezone.utc)
     payload = {
+        **_INSTALLATION_TOKEN_CLAIMS,
         "sub": user_id,
-        "type": "installation",
-        "aud": settings.jwt_audience,
-        "iss": settings.jwt_issuer,
-        "role": "authenticated",
         "email": email,
         "user_metadata": user_metadata,
-        "app_metadata": {"provider": "installation_token"},
+        "iat": int(now.timestamp()),
+        "exp": int((now + _INSTALLATION_TOKEN_LIFETIME).timestamp()),
     }
 
-    # 365 days expiration
-    from datetime import datetime, timedelta, timezone
-
-    now = datetime.now(timezone.utc)
-    exp = now + timedelta(days=365)
-    payload.update({"iat": int(now.timestamp()), "exp": int(exp.timestamp())})
-
-    secret = settings.supabase_jwt_secret or settings.supabase_anon_key
-    token = jwt.encode(payload, secret, algorithm="HS256")
+    # Same secret app.auth verifies with
+    token = jwt.encode(payload, JWT_SECRET_BYTES, algorithm="HS256")
     return {"installation_token": token, "token_type": "bearer", "expires_in_days": 365}
 
 
@@ -119,6 +132,9 @@ async def issue_api_key(
     - Server-side validation only
     - Can be revoked at any time
     
+    Only a SHA-256 hash of the key is stored, so the key itself is shown in
+    this response and can't be retrieved again later.
+    
     Args:
         user_id: Current authenticated user ID (from JWT)
         name: Optional name for the API key (default: "Gmail Add-on Key")
@@ -140,10 +156,8 @@ async def issue_api_key(
     """
     supabase = get_supabase_client()
     
-    # Generate a secure random API key
-    # Format: jobmail_<32 random URL-safe bytes>
-    random_bytes = secrets.token_urlsafe(32)
-    api_key = f"jobmail_{random_bytes}"
+    # Generate a secure random API key and the hash it is looked up by
+    api_key, api_key_hash = generate_api_key()
     
     # Insert into database
     now = datetime.now(timezone.utc)
@@ -151,7 +165,9 @@ async def issue_api_key(
     try:
         response = supabase.table("api_keys").insert({
             "user_id": user_id,
-            "api_key": api_key,
+            # Only the hash is stored (bytea hex input format); the raw key
+            # is returned once below and validation looks keys up by hash
+            "api_key_hash": "\\x" + api_key_hash.hex(),
             "name": name,
             "created_at": now.isoformat(),
             "expires_at": None,  # Never expires by default
@@ -172,8 +188,8 @@ async def issue_api_key(
             expires_at=created_key.get("expires_at"),
         )
         
-    except Exception as e:
-        print(f"Error creating API key: {e}")
+    except Exception:
+        logger.exception("Error creating API key")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create API key",
@@ -206,8 +222,8 @@ async def list_api_keys(user_id: CurrentUserId) -> dict:
             "api_keys": response.data or [],
         }
         
-    except Exception as e:
-        print(f"Error listing API keys: {e}")
+    except Exception:
+        logger.exception("Error listing API keys")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list API keys",
@@ -219,7 +235,8 @@ async def revoke_api_key(key_id: str, user_id: CurrentUserId) -> dict:
     """
     Revoke (delete) an API key.
     
-    This immediately invalidates the API key. Any requests using it will fail.
+    The key stops working at once in this worker. Other workers may still
+    accept it from their cache for up to settings.api_key_cache_ttl seconds.
     
     Args:
         key_id: UUID of the API key to revoke
@@ -231,8 +248,16 @@ async def revoke_api_key(key_id: str, user_id: CurrentUserId) -> dict:
     supabase = get_supabase_client()
     
     try:
-        # Delete the API key (RLS ensures user can only delete their own)
-        response = supabase.table("api_keys").delete().eq("id", key_id).eq("user_id", user_id).execute()
+        # Delete the API key (the user_id filter ensures users can only
+        # delete their own). The deleted row comes back so its hash can be
+        # dropped from the validated-key cache
+        response = (
+            supabase.table("api_keys")
+            .delete()
+            .eq("id", key_id)
+            .eq("user_id", user_id)
+            .execute()
+        )
         
         if not response.data:
             raise HTTPException(
@@ -240,12 +265,16 @@ async def revoke_api_key(key_id: str, user_id: CurrentUserId) -> dict:
                 detail="API key not found",
             )
         
+        # bytea comes back from PostgREST as "\x<hex>"
+        for row in response.data:
+            invalidate_api_key_cache(bytes.fromhex(row["api_key_hash"][2:]))
+        
         return {"message": "API key revoked successfully"}
         
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error revoking API key: {e}")
+    except Exception:
+        logger.exception("Error revoking API key")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to revoke API key",
@@ -17,21 +17,64 @@ This is useful for:
 - Analytics and reporting
 """
 
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 
 from app.deps import CurrentUserId
-from app.db import get_supabase_client
+from app.db import get_db_connection
+from app.responses import ORJSONResponse
 from app.schemas import EventCreate, EventResponse
+from app.services.applications import invalidate_analytics_cache
 
 # Create router for event-related endpoints
 router = APIRouter(tags=["Events"])
 
+# The user's application LEFT JOINed to its events: no rows means the
+# application doesn't exist (or isn't theirs); a single all-NULL event row
+# means it has no events yet
+_SELECT_EVENTS_SQL = """
+    SELECT e.*
+    FROM applications AS a
+    LEFT JOIN application_events AS e ON e.application_id = a.id
+    WHERE a.id = %s AND a.user_id = %s
+    ORDER BY e.created_at
+"""
+
+# Inserts the event only if the application exists and belongs to the user,
+# and applies the event's status (if any) to the application in the same
+# statement: one round trip and one transaction. No row back means 404
+_INSERT_EVENT_SQL = """
+    WITH owned AS (
+        SELECT id FROM applications
+        WHERE id = %(application_id)s AND user_id = %(user_id)s
+    ), status_update AS (
+        UPDATE applications AS a
+        SET status = %(status)s::application_status
+        FROM owned
+        WHERE a.id = owned.id AND %(status)s::application_status IS NOT NULL
+    )
+    INSERT INTO application_events (application_id, event_type, status, notes, metadata)
+    SELECT owned.id, %(event_type)s, %(status)s::application_status, %(notes)s, %(metadata)s
+    FROM owned
+    RETURNING *
+"""
+
 
-@router.get("/applications/{application_id}/events", response_model=list[EventResponse])
+# The rows come straight from our own database, so they are returned as an
+# ORJSONResponse without being validated into EventResponse models first;
+# `responses` keeps the schema in the OpenAPI docs
+@router.get(
+    "/applications/{application_id:uuid}/events",
+    response_model=None,
+    responses={200: {"model": list[EventResponse]}},
+)
 async def get_application_events(
-    application_id: str,
+    application_id: UUID,
     user_id: CurrentUserId,
-) -> list[EventResponse]:
+) -> ORJSONResponse:
     """
     Get all events for a specific application.
     
@@ -69,44 +112,31 @@ async def get_application_events(
             }
         ]
     """
-    supabase = get_supabase_client()
+    # Existence, ownership and the events in one query
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(_SELECT_EVENTS_SQL, (application_id, user_id))
+            rows = await cur.fetchall()
     
-    # First check if application exists and user has access
-    app_result = (
-        supabase.table("applications")
-        .select("id")
-        .eq("id", application_id)
-        .execute()
-    )
-    
-    if not app_result.data:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
     
-    # Get events for the application
-    result = (
-        supabase.table("application_events")
-        .select("*")
-        .eq("application_id", application_id)
-        .order("created_at", desc=False)  # Chronological order
-        .execute()
-    )
-    
-    return [EventResponse(**event) for event in result.data]
+    return ORJSONResponse([event for event in rows if event["id"] is not None])
 
 
 @router.post(
-    "/applications/{application_id}/events",
+    "/applications/{application_id:uuid}/events",
     response_model=EventResponse,
     status_code=status.HTTP_201_CREATED
 )
 async def create_application_event(
-    application_id: str,
+    application_id: UUID,
     data: EventCreate,
     user_id: CurrentUserId,
-) -> EventResponse:
+) -> dict:
     """
     Manually create an event for an application.
     
@@ -140,44 +170,31 @@ async def create_application_event(
             }
         }
     """
-    supabase = get_supabase_client()
-    
-    # First check if application exists and user has access
-    app_result = (
-        supabase.table("applications")
-        .select("id")
-        .eq("id", application_id)
-        .execute()
-    )
-    
-    if not app_result.data:
+    # Insert event and sync the application status (only if the
+    # application exists and belongs to the user)
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                _INSERT_EVENT_SQL,
+                {
+                    "application_id": application_id,
+                    "user_id": user_id,
+                    "event_type": data.event_type,
+                    "status": data.status,
+                    "notes": data.notes,
+                    "metadata": Jsonb(data.metadata or {}),
+                },
+            )
+            event = await cur.fetchone()
+    
+    if event is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
     
-    # Prepare event data
-    event_data = {
-        "application_id": application_id,
-        "event_type": data.event_type,
-        "status": data.status,
-        "notes": data.notes,
-        "metadata": data.metadata or {},
-    }
-    
-    # Insert event
-    result = supabase.table("application_events").insert(event_data).execute()
-    
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create event"
-        )
-    
-    # If status was provided, update the application status
     if data.status:
-        supabase.table("applications").update(
-            {"status": data.status}
-        ).eq("id", application_id).execute()
+        invalidate_analytics_cache(user_id)
     
-    return EventResponse(**result.data[0])
+    # response_model validates the row once; no EventResponse built here
+    return event
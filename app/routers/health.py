@@ -10,14 +10,38 @@ Health checks are important for:
 - Debugging connectivity issues
 """
 
-from fastapi import APIRouter
+import asyncio
+import logging
+import time
+
+import orjson
+from fastapi import APIRouter, Response, status
+
+from app.db import get_db_connection, get_supabase_client
+
+logger = logging.getLogger(__name__)
 
 # Create a router for health-related endpoints
 router = APIRouter()
 
+# Basic health response; app.main also serves it straight from an ASGI
+# fast path for /health and /v1/health
+HEALTH_STATUS = {"status": "ok", "version": "route-fix-v3", "timestamp": "2025-10-27T01:30:00Z"}
+# Encoded once; the body never changes
+HEALTH_BODY = orjson.dumps(HEALTH_STATUS)
+
+# Each dependency probe gives up after this many seconds, so a slow
+# database makes the detailed check fail fast instead of hanging the probe
+PROBE_TIMEOUT = 1.0
+# A healthy result is reused for this long, so frequent probes don't each
+# add database load; failures are never cached
+DETAILED_HEALTH_TTL = 5.0
+# (monotonic time it was computed, encoded body) of the last healthy result
+_detailed_health_cache: tuple[float, bytes] | None = None
 
-@router.get("/health")
-async def health_check() -> dict[str, str]:
+
+@router.get("/health", response_class=Response)
+async def health_check() -> Response:
     """
     Basic health check endpoint.
     
@@ -25,32 +49,60 @@ async def health_check() -> dict[str, str]:
     It doesn't check database connectivity or other dependencies - that's
     what the detailed health endpoint is for.
     
+    The body is pre-encoded at import, so a probe skips building a dict
+    and FastAPI's serializer entirely.
+    
     Returns:
-        dict: Status message
+        Response: Status message as JSON
         
     Example Response:
         {
             "status": "ok"
         }
     """
-    return {"status": "ok", "version": "route-fix-v3", "timestamp": "2025-10-27T01:30:00Z"}
+    return Response(content=HEALTH_BODY, media_type="application/json")
+
+
+async def _check_database() -> None:
+    """Run SELECT 1 on a pooled PostgreSQL connection."""
+    async with get_db_connection() as conn:
+        await conn.execute("SELECT 1")
 
 
-@router.get("/health/detailed")
-async def detailed_health_check() -> dict[str, str | dict[str, str]]:
+async def _check_supabase() -> None:
+    """Make a one-row PostgREST request through the shared Supabase client."""
+    supabase = get_supabase_client()
+    await asyncio.to_thread(supabase.table("profiles").select("id").limit(1).execute)
+
+
+async def _probe(name: str, check) -> str:
+    """Run one dependency check with PROBE_TIMEOUT; return "ok", "timeout" or "error"."""
+    try:
+        await asyncio.wait_for(check(), timeout=PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Health check: %s timed out after %ss", name, PROBE_TIMEOUT)
+        return "timeout"
+    except Exception:
+        logger.warning("Health check: %s failed", name, exc_info=True)
+        return "error"
+    return "ok"
+
+
+@router.get("/health/detailed", response_class=Response)
+async def detailed_health_check() -> Response:
     """
     Detailed health check with dependency status.
     
-    In a production system, this would check:
-    - Database connectivity
-    - External API availability
-    - Redis/cache status
-    - File system access
+    Checks, concurrently and each with a PROBE_TIMEOUT limit:
+    - database: SELECT 1 over the direct PostgreSQL pool
+    - supabase: a one-row query through the Supabase (PostgREST) client
     
-    For now, it's a placeholder for future enhancement.
+    Responds 503 if any check fails, so load balancers take the instance
+    out of rotation. A healthy result is reused for DETAILED_HEALTH_TTL
+    seconds.
     
     Returns:
-        dict: Detailed status information
+        Response: Detailed status information as JSON
         
     Example Response:
         {
@@ -61,22 +113,29 @@ async def detailed_health_check() -> dict[str, str | dict[str, str]]:
             }
         }
     """
-    # TODO: Add actual health checks in Stage 4+
-    # Example:
-    # try:
-    #     supabase = get_supabase_client()
-    #     supabase.table("profiles").select("id").limit(1).execute()
-    #     database_status = "ok"
-    # except Exception:
-    #     database_status = "error"
+    global _detailed_health_cache
+    now = time.monotonic()
+    if _detailed_health_cache is not None and now - _detailed_health_cache[0] < DETAILED_HEALTH_TTL:
+        return Response(content=_detailed_health_cache[1], media_type="application/json")
     
-    return {
-        "status": "ok",
-        "checks": {
-            "database": "not_implemented",
-            "supabase": "not_implemented",
-        }
-    }
+    database, supabase = await asyncio.gather(
+        _probe("database", _check_database),
+        _probe("supabase", _check_supabase),
+    )
+    healthy = database == "ok" and supabase == "ok"
+    body = orjson.dumps({
+        "status": "ok" if healthy else "error",
+        "checks": {"database": database, "supabase": supabase},
+    })
+    
+    if not healthy:
+        return Response(
+            content=body,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            media_type="application/json",
+        )
+    _detailed_health_cache = (now, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/debug/auth")
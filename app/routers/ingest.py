@@ -11,28 +11,293 @@ This router handles email forwarding and parsing:
 This is the core endpoint that the Gmail Add-on or email forwarding service calls.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, status
+from postgrest.exceptions import APIError
 
 from app.deps import CurrentUserId, FlexibleUserId  # FlexibleUserId supports both API keys and JWT
-from app.schemas import EmailIngest, IngestResponse, ApplicationCreate
+from app.schemas import EmailIngest, IngestResponse, ApplicationCreate, ApplicationUpdate
 from app.services.parsing import EmailParser, parse_job_application_email
 from app.services.emails import (
     store_email_message,
+    store_email_messages,
     generate_email_hash,
     check_duplicate_email,
+    ingest_lookup,
+    ingest_lookup_many,
 )
-from app.services.applications import create_application
+from app.services.applications import create_application, create_applications, update_application
 from app.services import profiles as profile_service
-from app.db import get_supabase_client
+
+logger = logging.getLogger(__name__)
 
 # Create router for email ingestion endpoints
 router = APIRouter(prefix="/ingest", tags=["Email Ingestion"])
 
+# Stateless, so one instance serves every request
+_PARSER = EmailParser()
+
+async def _store_email_in_background(email_data: EmailIngest, application_id: str | None) -> None:
+    """
+    Store the raw email after the response has been sent.
+    
+    Nobody is waiting on the result any more, so a failure is logged
+    rather than raised.
+    """
+    try:
+        await store_email_message(email_data=email_data, application_id=application_id)
+    except Exception as e:
+        logger.warning("Failed to store email message: %s", e)
+
+
+# Map all status variations to the simplified statuses we actually use
+# This ensures old/different status names are normalized correctly
+_STATUS_MAP = {
+    # Rejection variants
+    "reject": "rejected",
+    "rejection": "rejected",
+    "declined": "rejected",
+    "decline": "rejected",
+    # Interview variants → interviewing
+    "interview": "interviewing",
+    "interviews": "interviewing",
+    "interview_scheduled": "interviewing",
+    "interview_completed": "interviewing",
+    "screening": "interviewing",
+    "screen": "interviewing",
+    # Offer variants → offer
+    "offer received": "offer",
+    "offer_received": "offer",
+    "offeraccepted": "offer",
+    "accepted offer": "offer",
+    "accepted": "offer",
+    # Keep these as-is (already simplified)
+    "applied": "applied",
+    "interviewing": "interviewing",
+    "offer": "offer",
+    "rejected": "rejected",
+    "withdrawn": "withdrawn",
+    "wishlist": "applied",  # Map wishlist to applied for simplicity
+}
+
+# Only allow the simplified statuses that match our database enum
+_ALLOWED_STATUSES = frozenset({"applied", "interviewing", "offer", "rejected", "withdrawn"})
+
+
+# Emails per POST /ingest/emails request
+MAX_BATCH_EMAILS = 100
+
+
+async def _store_emails_in_background(emails: list[tuple[EmailIngest, str | None]]) -> None:
+    """Store a batch's emails after the response has been sent (see _store_email_in_background)."""
+    try:
+        await store_email_messages(emails)
+    except Exception as e:
+        logger.warning("Failed to store %d email messages: %s", len(emails), e)
+
+
+async def _update_from_duplicate_email(
+    existing_app: dict,
+    parsed: dict,
+    user_id: str,
+) -> IngestResponse:
+    """
+    Handle an email that was already ingested and linked to an application.
+    
+    The application's status and job URL are brought up to date with what
+    this copy of the email says.
+    """
+    logger.debug(
+        "Duplicate email detected; parsed status=%s, source_url=%s",
+        parsed.get("status"), parsed.get("source_url"),
+    )
+    
+    current_status = existing_app.get("status") or "applied"
+    logger.debug("Existing application status: %s", current_status)
+    
+    # If status has changed, update the application
+    needs_update = False
+    update_kwargs = {}
+
+    # Normalized as for new applications; a status we don't track isn't applied
+    new_status = _STATUS_MAP.get((parsed.get("status") or "").strip().lower())
+    if new_status and new_status != current_status and new_status != "applied":
+        needs_update = True
+        update_kwargs["status"] = new_status
+        update_kwargs["notes"] = (
+            f"Status updated from email. Previous: {current_status}, New: {new_status}"
+        )
+
+    new_source_url = parsed.get("source_url")
+    current_source_url = existing_app.get("source_url")
+    if new_source_url and new_source_url != current_source_url:
+        needs_update = True
+        update_kwargs["source_url"] = new_source_url
+
+    if needs_update:
+        update_data = ApplicationUpdate(**update_kwargs)
+
+        try:
+            await update_application(existing_app["id"], user_id, update_data)
+            logger.debug("Application updated from duplicate email")
+            return IngestResponse(
+                success=True,
+                application_id=existing_app["id"],
+                message="Duplicate email detected, application updated with latest info",
+                duplicate=True,
+            )
+        except Exception:
+            logger.exception("Failed to update application from duplicate email")
+            return IngestResponse(
+                success=True,
+                application_id=existing_app["id"],
+                message="Duplicate email detected, using existing application (update failed)",
+                duplicate=True,
+            )
+
+    logger.debug("No updates needed from duplicate email")
+    return IngestResponse(
+        success=True,
+        application_id=existing_app["id"],
+        message="Duplicate email detected, using existing application",
+        duplicate=True,
+    )
+
+
+def _not_job_email_response(email_data: EmailIngest) -> IngestResponse:
+    """Result for an email that isn't about a job application (it isn't tracked)."""
+    logger.info(
+        "Email is not a job application. Subject: %r, sender: %r",
+        email_data.subject, email_data.sender,
+    )
+    return IngestResponse(
+        success=False,
+        application_id=None,
+        message=(
+            "This email does not appear to be a job application email. "
+            "JobMail only tracks emails related to job applications, interviews, offers, and rejections. "
+            "If you believe this is an error, please contact support."
+        ),
+        duplicate=False,
+    )
+
+
+def _insufficient_info_response(parsed: dict) -> IngestResponse:
+    """Result for a job email whose company or position couldn't be extracted."""
+    return IngestResponse(
+        success=False,
+        application_id=None,
+        message=(
+            f"Could not extract sufficient information from email. "
+            f"Company: {parsed.get('company')}, Position: {parsed.get('position')}. "
+            f"Email saved for manual review."
+        ),
+        duplicate=False,
+    )
+
+
+def _already_tracked_response(application_id: str, parsed: dict) -> IngestResponse:
+    """Result for a job email whose company + position already has an application."""
+    return IngestResponse(
+        success=True,
+        application_id=application_id,
+        message=(
+            f"This application has already been tracked. "
+            f"Company: {parsed.get('company')}, Position: {parsed.get('position')}"
+        ),
+        duplicate=True,
+    )
+
+
+def _application_from_email(email_data: EmailIngest, parsed: dict) -> ApplicationCreate:
+    """Build the new application for a parsed job email."""
+    raw_status = (parsed.get("status") or "").strip().lower()
+    normalized_status = _STATUS_MAP.get(raw_status, "applied")  # Default to "applied" if unknown
+    
+    # Final validation: ensure it's in allowed list (should always pass after mapping)
+    if normalized_status not in _ALLOWED_STATUSES:
+        normalized_status = "applied"
+
+    logger.debug(
+        "Creating application with status %r (raw %r)", normalized_status, raw_status
+    )
+    
+    return ApplicationCreate(
+        company=parsed["company"],
+        position=parsed["position"],
+        status=normalized_status,
+        notes=f"Auto-created from email. Confidence: {parsed.get('confidence', 0)}",
+        applied_at=email_data.received_at,  # Use email received date as applied_at
+        source_url=parsed.get("source_url"),  # Use the job URL from email parsing
+    )
+
+
+def _created_response(
+    application_id: str,
+    email_data: EmailIngest,
+    parsed: dict,
+) -> IngestResponse:
+    """Result for an email that created a new application."""
+    # Prepare status detection information for response
+    status_detection = None
+    if email_data.detected_status:
+        status_detection = {
+            'detected_status': email_data.detected_status,
+            'confidence': email_data.status_confidence,
+            'indicators': email_data.status_indicators,
+            'reasoning': email_data.status_reasoning,
+            'is_job_related': email_data.is_job_related,
+            'urgency': email_data.urgency
+        }
+    
+    # IngestResponse has a status_detection field, so the model is returned
+    # as-is (no .dict() copy); it is None when nothing was detected
+    return IngestResponse(
+        success=True,
+        application_id=application_id,
+        message=f"Application created successfully from email (confidence: {parsed.get('confidence', 0)})",
+        duplicate=False,
+        status_detection=status_detection,
+    )
+
+
+def _api_error_status(exc: APIError) -> int:
+    """
+    Pick the HTTP status for a PostgREST error raised while writing.
+    
+    Conflicts with existing rows are 409 and rejected values are 400; only
+    anything else is our fault (500).
+    """
+    code = exc.code or ""
+    if code == "23505":  # unique_violation
+        return status.HTTP_409_CONFLICT
+    if code.startswith(("22", "23")):  # data exception, integrity constraint
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+async def _ensure_profile(user_id: str) -> None:
+    """Ensure the user profile exists so foreign key constraints pass."""
+    try:
+        # Remembered per user, so warm users skip the profile lookup
+        if await profile_service.ensure_profile(user_id):
+            logger.info("No profile found for user %s, created default profile", user_id)
+    except Exception as exc:  # pragma: no cover - log and fail fast
+        logger.exception("Failed to ensure profile for %s", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Profile error: {str(exc)}"
+        )
+
 
 @router.post("/email", response_model=IngestResponse)
 async def ingest_email(
     email_data: EmailIngest,
     user_id: FlexibleUserId,  # Supports API key (X-API-Key header) or JWT
+    background_tasks: BackgroundTasks,
 ) -> IngestResponse:
     """
     Receive and process a forwarded job application email.
@@ -41,7 +306,7 @@ async def ingest_email(
     1. Checks for duplicate emails
     2. Parses the email to extract application details
     3. Creates a new application (or updates existing)
-    4. Stores the email message for reference
+    4. Stores the email message for reference (after the response is sent)
     5. Returns the created application ID
     
     Idempotency:
@@ -85,315 +350,204 @@ async def ingest_email(
         }
     """
     # Step 0: Ensure the user profile exists so foreign key constraints pass
-    print(f"🔍 INGEST DEBUG: Starting ingestion for user_id={user_id}")
-    print(f"🔍 INGEST DEBUG: Email subject={email_data.subject}, sender={email_data.sender}")
-    
-    try:
-        profile = await profile_service.get_profile(user_id)
-        if profile:
-            print(f"✅ Profile exists for user {user_id}: {profile.get('email')}")
-        else:
-            print(f"⚠️ No profile found for user {user_id}, creating default profile...")
-            profile = await profile_service.create_default_profile(user_id)
-            print(f"✅ Created default profile for user {user_id}: {profile.get('email')}")
-    except Exception as exc:  # pragma: no cover - log and fail fast
-        print(f"❌ CRITICAL: Failed to ensure profile for {user_id}: {exc}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Profile error: {str(exc)}"
-        )
+    logger.debug("Starting ingestion for user_id=%s", user_id)
+    logger.debug("Email subject=%s, sender=%s", email_data.subject, email_data.sender)
+    await _ensure_profile(user_id)
 
-    # Step 1: Check for duplicate email
+    # Step 1: Parse the email (local heuristics, no I/O) and look up both
+    # kinds of duplicate - same email, same company + position - in one query
     email_hash = generate_email_hash(email_data)
-    existing_email = await check_duplicate_email(email_hash)
+    parsed = parse_job_application_email(email_data)
+    lookup = await ingest_lookup(
+        user_id, email_hash, parsed.get("company"), parsed.get("position")
+    )
     
-    if existing_email and existing_email.get("application_id"):
+    existing_app = lookup["app_by_hash"]
+    if existing_app:
         # Duplicate found with linked application - check if status needs updating
-        print(f"🔄 Duplicate email detected, checking for status update...")
-        
-        # Parse the new email to get the updated data
-        parsed = parse_job_application_email(email_data)
-        print(f"🔄 New email parsed status: {parsed.get('status')}")
-        print(f"🔄 New email parsed source_url: {parsed.get('source_url')}")
-        
-        # Get the existing application to check current status
-        from app.services.applications import get_application_by_id
-        existing_app = await get_application_by_id(existing_email["application_id"], user_id)
-        current_status = existing_app.get("status") if existing_app else "applied"
-        print(f"🔄 Existing application status: {current_status}")
-        
-        # If status has changed, update the application
-        needs_update = False
-        update_kwargs = {}
-
-        new_status = parsed.get("status")
-        if new_status and new_status != current_status and new_status != "applied":
-            needs_update = True
-            update_kwargs["status"] = new_status
-            update_kwargs["notes"] = (
-                f"Status updated from email. Previous: {current_status}, New: {new_status}"
-            )
-
-        new_source_url = parsed.get("source_url")
-        current_source_url = existing_app.get("source_url") if existing_app else None
-        if new_source_url and new_source_url != current_source_url:
-            needs_update = True
-            update_kwargs["source_url"] = new_source_url
-
-        if needs_update:
-            from app.services.applications import update_application
-            from app.schemas import ApplicationUpdate
-
-            update_data = ApplicationUpdate(**update_kwargs)
-
-            try:
-                await update_application(existing_email["application_id"], user_id, update_data)
-                print("✅ Application updated successfully from duplicate email")
-                return IngestResponse(
-                    success=True,
-                    application_id=existing_email["application_id"],
-                    message="Duplicate email detected, application updated with latest info",
-                    duplicate=True,
-                )
-            except Exception as e:
-                print(f"❌ Failed to update application from duplicate email: {e}")
-                return IngestResponse(
-                    success=True,
-                    application_id=existing_email["application_id"],
-                    message="Duplicate email detected, using existing application (update failed)",
-                    duplicate=True,
-                )
-
-        print("🔄 No updates needed from duplicate email")
-        return IngestResponse(
-            success=True,
-            application_id=existing_email["application_id"],
-            message="Duplicate email detected, using existing application",
-            duplicate=True,
-        )
+        return await _update_from_duplicate_email(existing_app, parsed, user_id)
     
-    # Step 2: Check if email is actually job-related BEFORE parsing
-    print(f"🔍 Checking if email is job-related...")
-    parser = EmailParser()
-    is_job_email = parser._is_job_application(email_data)
-    print(f"🔍 Job application check result: {is_job_email}")
+    # Step 2: Check if the email is actually job-related before tracking it.
+    # This may make a blocking OpenAI request (up to 10s), so it runs in a
+    # worker thread rather than stalling every other request on the loop
+    is_job_email = await asyncio.to_thread(_PARSER._is_job_application, email_data)
+    logger.debug("Job application check result: %s", is_job_email)
     
     if not is_job_email:
         # Email is NOT job-related - don't track it
-        print(f"❌ Email is NOT a job application. Subject: '{email_data.subject}'")
-        print(f"❌ Sender: '{email_data.sender}'")
-        return IngestResponse(
-            success=False,
-            application_id=None,
-            message=(
-                "This email does not appear to be a job application email. "
-                "JobMail only tracks emails related to job applications, interviews, offers, and rejections. "
-                "If you believe this is an error, please contact support."
-            ),
-            duplicate=False,
-        )
-    
-    print(f"✅ Email is job-related, proceeding with parsing...")
-    
-    # Step 3: Parse email to extract application details
-    print(f"Email data received: {email_data}")
-    print(f"Detected status: {getattr(email_data, 'detected_status', 'NOT_SET')}")
-    print(f"Parsed status: {getattr(email_data, 'parsed_status', 'NOT_SET')}")
-    print(f"Parsed company: {getattr(email_data, 'parsed_company', 'NOT_SET')}")
-    print(f"Parsed position: {getattr(email_data, 'parsed_position', 'NOT_SET')}")
+        return _not_job_email_response(email_data)
     
-    # Debug: Print all attributes of email_data
-    print(f"All email_data attributes: {dir(email_data)}")
-    if hasattr(email_data, 'detected_status'):
-        print(f"detected_status value: '{email_data.detected_status}' (type: {type(email_data.detected_status)})")
-    if hasattr(email_data, 'parsed_status'):
-        print(f"parsed_status value: '{email_data.parsed_status}' (type: {type(email_data.parsed_status)})")
-    
-    parsed = parse_job_application_email(email_data)
-    print(f"Final parsed result: {parsed}")
+    # Step 3: Log the parsed application details (from Step 1)
+    # Only build the field dump when someone is reading debug output
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Email data received: detected_status=%r parsed_status=%r "
+            "parsed_company=%r parsed_position=%r",
+            email_data.detected_status,
+            email_data.parsed_status,
+            email_data.parsed_company,
+            email_data.parsed_position,
+        )
+        logger.debug("Final parsed result: %s", parsed)
     
-    # Step 3: Validate parsed data
+    # Step 4: Validate parsed data
     if not parsed.get("company") or not parsed.get("position"):
         # Couldn't extract enough information
         # Still store the email for manual processing
-        email_record = await store_email_message(
-            email_data=email_data,
-            application_id=None,
-        )
-        
-        return IngestResponse(
-            success=False,
-            application_id=None,
-            message=(
-                f"Could not extract sufficient information from email. "
-                f"Company: {parsed.get('company')}, Position: {parsed.get('position')}. "
-                f"Email saved for manual review."
-            ),
-            duplicate=False,
-        )
+        background_tasks.add_task(_store_email_in_background, email_data, None)
+        return _insufficient_info_response(parsed)
     
     # Step 5: Check for existing application with same company + position (prevent duplicates)
-    company_name = parsed.get("company")
-    position_name = parsed.get("position")
-    
-    if company_name and position_name:
-        print(f"🔍 Checking for existing application: {company_name} - {position_name}")
-        # Get all user's applications to check for duplicates
-        try:
-            from app.routers.applications import list_applications as get_user_applications
-            from app.deps import CurrentUserId
-            
-            # Simple query to check for duplicate by company + position
-            supabase = get_supabase_client()
-            existing_apps = (
-                supabase.table("applications")
-                .select("id, company, position, status")
-                .eq("user_id", user_id)
-                .eq("company", company_name)
-                .eq("position", position_name)
-                .execute()
-            )
-            
-            if existing_apps.data and len(existing_apps.data) > 0:
-                existing_app = existing_apps.data[0]
-                print(f"🔄 Duplicate application found: {existing_app['id']}")
-                print(f"🔄 Existing application status: {existing_app.get('status')}")
-                
-                # Return duplicate response - application already exists
-                return IngestResponse(
-                    success=True,
-                    application_id=existing_app["id"],
-                    message=f"This application has already been tracked. Company: {company_name}, Position: {position_name}",
-                    duplicate=True,
-                )
-        except Exception as dup_check_error:
-            print(f"⚠️ Error checking for duplicate application: {dup_check_error}")
-            # Continue with creation if duplicate check fails
+    # (looked up together with the email hash in Step 1)
+    existing_app = lookup["app_by_company_position"]
+    if existing_app:
+        logger.debug("Duplicate application found: %s", existing_app["id"])
+        
+        # Return duplicate response - application already exists
+        return _already_tracked_response(existing_app["id"], parsed)
     
-    # Step 6: Create application
+    # Step 6: Create application. A subscription limit comes back from
+    # create_application as a 403 HTTPException and passes straight through
+    app_data = _application_from_email(email_data, parsed)
     try:
-        # Map all status variations to the simplified statuses we actually use
-        # This ensures old/different status names are normalized correctly
-        status_map = {
-            # Rejection variants
-            "reject": "rejected",
-            "rejection": "rejected",
-            "declined": "rejected",
-            "decline": "rejected",
-            # Interview variants → interviewing
-            "interview": "interviewing",
-            "interviews": "interviewing",
-            "interview_scheduled": "interviewing",
-            "interview_completed": "interviewing",
-            "screening": "interviewing",
-            "screen": "interviewing",
-            # Offer variants → offer
-            "offer received": "offer",
-            "offer_received": "offer",
-            "offeraccepted": "offer",
-            "accepted offer": "offer",
-            "accepted": "offer",
-            # Keep these as-is (already simplified)
-            "applied": "applied",
-            "interviewing": "interviewing",
-            "offer": "offer",
-            "rejected": "rejected",
-            "withdrawn": "withdrawn",
-            "wishlist": "applied",  # Map wishlist to applied for simplicity
-        }
-        
-        # Only allow the simplified statuses that match our database enum
-        allowed_statuses = {"applied", "interviewing", "offer", "rejected", "withdrawn"}
-        
-        raw_status = (parsed.get("status") or "").strip().lower()
-        normalized_status = status_map.get(raw_status, "applied")  # Default to "applied" if unknown
-        
-        # Final validation: ensure it's in allowed list (should always pass after mapping)
-        if normalized_status not in allowed_statuses:
-            normalized_status = "applied"
-
-        print(f"🔍 CRITICAL DEBUG: About to create application with status: '{normalized_status}' (raw: '{raw_status}')")
-        print(f"🔍 CRITICAL DEBUG: parsed data keys: {list(parsed.keys())}")
-        print(f"🔍 CRITICAL DEBUG: parsed status value: '{parsed.get('status')}' (type: {type(parsed.get('status'))})")
-        print(f"🔍 CRITICAL DEBUG: parsed company: '{parsed.get('company')}'")
-        print(f"🔍 CRITICAL DEBUG: parsed position: '{parsed.get('position')}'")
-        
-        app_data = ApplicationCreate(
-            company=parsed["company"],
-            position=parsed["position"],
-            status=normalized_status,
-            notes=f"Auto-created from email. Confidence: {parsed.get('confidence', 0)}",
-            applied_at=email_data.received_at,  # Use email received date as applied_at
-            source_url=parsed.get("source_url"),  # Use the job URL from email parsing
+        application = await create_application(user_id=user_id, data=app_data)
+    except APIError as exc:
+        logger.exception("create_application failed for user %s", user_id)
+        raise HTTPException(
+            status_code=_api_error_status(exc),
+            detail=f"Failed to create application: {exc.message or exc}"
         )
-        
-        print(f"🔍 CRITICAL DEBUG: ApplicationCreate object created: company='{app_data.company}', position='{app_data.position}', status='{app_data.status}'")
-        print(f"🔍 CRITICAL DEBUG: Calling create_application for user_id={user_id}")
-        
-        try:
-            application = await create_application(user_id=user_id, data=app_data)
-            print(f"✅ Application created successfully: {application.get('id')}")
-            application_id = application["id"]
-        except Exception as create_exc:
-            print(f"❌ CRITICAL: create_application failed: {create_exc}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create application: {str(create_exc)}"
-            )
-        
     except HTTPException:
-        # Re-raise HTTP exceptions as-is
         raise
-    except Exception as e:
-        print(f"❌ CRITICAL: Unexpected error in application creation block: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+    except Exception as exc:
+        logger.exception("create_application failed for user %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Unexpected error: {str(e)}"
+            detail=f"Failed to create application: {str(exc)}"
         )
+    application_id = application["id"]
+    logger.debug("Application created: %s", application_id)
     
-    # Step 5: Store email message linked to application
-    try:
-        await store_email_message(
-            email_data=email_data,
-            application_id=application_id,
-        )
-    except Exception as e:
-        # Application created but email storage failed
-        # Don't fail the request, just log the error
-        print(f"Warning: Failed to store email message: {e}")
+    # Step 7: Store email message linked to application. The caller only
+    # needs the application, so this runs after the response is sent
+    background_tasks.add_task(_store_email_in_background, email_data, application_id)
     
-    # Prepare status detection information for response
-    status_detection = None
-    if hasattr(email_data, 'detected_status') and email_data.detected_status:
-        status_detection = {
-            'detected_status': email_data.detected_status,
-            'confidence': email_data.status_confidence,
-            'indicators': email_data.status_indicators,
-            'reasoning': email_data.status_reasoning,
-            'is_job_related': email_data.is_job_related,
-            'urgency': email_data.urgency
-        }
+    return _created_response(application_id, email_data, parsed)
+
+
+@router.post("/emails", response_model=list[IngestResponse])
+async def ingest_emails(
+    emails: Annotated[list[EmailIngest], Body(max_length=MAX_BATCH_EMAILS)],
+    user_id: FlexibleUserId,  # Supports API key (X-API-Key header) or JWT
+    background_tasks: BackgroundTasks,
+) -> list[IngestResponse]:
+    """
+    Receive and process a batch of forwarded emails (up to 100).
     
-    response = IngestResponse(
-        success=True,
-        application_id=application_id,
-        message=f"Application created successfully from email (confidence: {parsed.get('confidence', 0)})",
-        duplicate=False,
-    )
+    Used by the Gmail Add-on's initial sync. Each email is handled as
+    POST /ingest/email would, but the work is batched: the profile is
+    checked once, duplicates for every email are found in one query, new
+    applications are created with one insert and the emails are stored with
+    another. The subscription limit is checked once for the batch; emails
+    past the limit aren't ingested.
     
-    # Add status detection to response if available
-    if status_detection:
-        response_dict = response.dict()
-        response_dict['status_detection'] = status_detection
-        return response_dict
+    Emails in the same batch for the same company + position create one
+    application; the later ones are reported as already tracked.
     
-    return response
+    Returns:
+        One ingestion result per email, in the order received
+    """
+    logger.debug("Starting batch ingestion of %d emails for user_id=%s", len(emails), user_id)
+    if not emails:
+        return []
+    await _ensure_profile(user_id)
+
+    parsed = [parse_job_application_email(email_data) for email_data in emails]
+    lookups = await ingest_lookup_many(
+        user_id,
+        [
+            (generate_email_hash(email_data), p.get("company"), p.get("position"))
+            for email_data, p in zip(emails, parsed)
+        ],
+    )
+
+    responses: list[IngestResponse | None] = [None] * len(emails)
+    pending: list[int] = []
+    for i, lookup in enumerate(lookups):
+        existing_app = lookup["app_by_hash"]
+        if existing_app:
+            responses[i] = await _update_from_duplicate_email(existing_app, parsed[i], user_id)
+        else:
+            pending.append(i)
+
+    # The job check may ask OpenAI; run those requests side by side
+    is_job_emails = await asyncio.gather(
+        *(asyncio.to_thread(_PARSER._is_job_application, emails[i]) for i in pending)
+    )
+
+    unlinked: list[EmailIngest] = []
+    to_create: list[int] = []
+    new_by_name: dict[tuple[str, str], int] = {}
+    same_as: dict[int, int] = {}  # email -> earlier email in this batch creating its application
+    for i, is_job_email in zip(pending, is_job_emails):
+        email_data, p = emails[i], parsed[i]
+        if not is_job_email:
+            responses[i] = _not_job_email_response(email_data)
+        elif not p.get("company") or not p.get("position"):
+            unlinked.append(email_data)
+            responses[i] = _insufficient_info_response(p)
+        elif lookups[i]["app_by_company_position"]:
+            responses[i] = _already_tracked_response(lookups[i]["app_by_company_position"]["id"], p)
+        else:
+            name = (p["company"].lower(), p["position"].lower())
+            if name in new_by_name:
+                same_as[i] = new_by_name[name]
+            else:
+                new_by_name[name] = i
+                to_create.append(i)
+
+    try:
+        created = await create_applications(
+            user_id, [_application_from_email(emails[i], parsed[i]) for i in to_create]
+        )
+    except APIError as exc:
+        logger.exception("create_applications failed for user %s", user_id)
+        raise HTTPException(
+            status_code=_api_error_status(exc),
+            detail=f"Failed to create applications: {exc.message or exc}"
+        )
+    except Exception as exc:
+        logger.exception("create_applications failed for user %s", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create applications: {str(exc)}"
+        )
+
+    linked: list[tuple[EmailIngest, str]] = []
+    for i, application in zip(to_create, created):
+        responses[i] = _created_response(application["id"], emails[i], parsed[i])
+        linked.append((emails[i], application["id"]))
+    for i in to_create[len(created):]:
+        responses[i] = IngestResponse(
+            success=False,
+            application_id=None,
+            message=(
+                "You've reached your application limit. "
+                "Upgrade to Pro for unlimited applications and automatic tracking."
+            ),
+            duplicate=False,
+        )
+    for i, first in same_as.items():
+        if responses[first].success:
+            responses[i] = _already_tracked_response(responses[first].application_id, parsed[i])
+        else:
+            responses[i] = responses[first]
+
+    stored = linked + [(email_data, None) for email_data in unlinked]
+    if stored:
+        background_tasks.add_task(_store_emails_in_background, stored)
+
+    return responses
 
 
 @router.post("/email/test", response_model=dict)
@@ -27,7 +27,10 @@ async def create_my_profile(user_id: CurrentUserId, data: ProfileCreate) -> Prof
 
 @router.put("/me", response_model=ProfileResponse)
 async def update_my_profile(user_id: CurrentUserId, data: ProfileUpdate) -> ProfileResponse:
-    profile = await profile_service.update_profile(user_id, data.model_dump(exclude_unset=True))
+    # One dump of just the fields to write; None never overwrites a value
+    profile = await profile_service.update_profile(
+        user_id, data.model_dump(exclude_unset=True, exclude_none=True)
+    )
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     return ProfileResponse(**profile)
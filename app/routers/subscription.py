@@ -8,8 +8,10 @@ API endpoints for subscription management:
 - Handle Stripe webhook events
 """
 
+import logging
 from typing import Dict, Any
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request, status, Header
 from fastapi.responses import Response
 
@@ -17,23 +19,38 @@ from app.deps import FlexibleUserId
 from app.services.subscription import get_subscription_service
 from app.services.payment import get_payment_service
 from app.config import settings
+from app.responses import ORJSONResponse
 
+try:
+    import stripe
+except ImportError:  # payment features are disabled (see app.services.payment)
+    stripe = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# Resolved once at import, like the rest of the Stripe configuration
+_STRIPE_WEBHOOK_SECRET = settings.stripe_webhook_secret
 
 router = APIRouter(prefix="/subscription", tags=["Subscription"])
 
+# The last plans list served by /plans and its encoded response body
+_plans_body: tuple[list, bytes] | None = None
+
 
-@router.get("/status")
-async def get_subscription_status(user_id: FlexibleUserId) -> Dict[str, Any]:
+@router.get("/status", response_class=ORJSONResponse)
+async def get_subscription_status(user_id: FlexibleUserId) -> ORJSONResponse:
     """Return the current user's subscription status and usage."""
     service = get_subscription_service()
 
     try:
-        subscription = await service.get_user_subscription(user_id)
+        subscription, applications_count = await service.get_subscription_status(user_id)
         plan = subscription.get("subscription_plans", {})
         features = plan.get("features", {})
-        applications_count = await service.get_user_application_count(user_id)
 
-        return {
+        # Returned as a response so FastAPI doesn't validate and re-encode
+        # the dict (it's built here from trusted data) before orjson does
+        return ORJSONResponse({
             "subscription": {
                 "plan_name": plan.get("display_name", "Free"),
                 "plan_id": plan.get("id"),
@@ -47,29 +64,34 @@ async def get_subscription_status(user_id: FlexibleUserId) -> Dict[str, Any]:
                 "applications_count": applications_count,
                 "applications_limit": features.get("max_applications"),
             },
-        }
+        })
 
-    except Exception as exc:
-        print(f"Error getting subscription status: {exc}")
+    except Exception:
+        logger.exception("Error getting subscription status for %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch subscription status",
         )
 
 
-@router.get("/plans")
-async def list_subscription_plans(user_id: FlexibleUserId) -> Dict[str, Any]:
+@router.get("/plans", response_class=ORJSONResponse)
+async def list_subscription_plans(user_id: FlexibleUserId) -> Response:
     """Return all active subscription plans."""
     # user_id is only used to enforce authentication; actual value not needed here.
     _ = user_id
     service = get_subscription_service()
 
     try:
+        global _plans_body
         plans = await service.get_all_plans()
-        return {"plans": plans}
-
-    except Exception as exc:
-        print(f"Error listing subscription plans: {exc}")
+        # The service hands back the same list until its cache expires, so
+        # the encoded body is reused until then
+        if _plans_body is None or _plans_body[0] is not plans:
+            _plans_body = (plans, orjson.dumps({"plans": plans}))
+        return Response(content=_plans_body[1], media_type="application/json")
+
+    except Exception:
+        logger.exception("Error listing subscription plans")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch subscription plans",
@@ -116,8 +138,8 @@ async def create_upgrade_checkout(
 
     except HTTPException:
         raise
-    except Exception as exc:
-        print(f"Error creating upgrade checkout: {exc}")
+    except Exception:
+        logger.exception("Error creating upgrade checkout for %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create checkout session",
@@ -138,6 +160,11 @@ async def stripe_webhook_handler(
     - customer.subscription.deleted
     - checkout.session.completed
     
+    The event is processed before responding: a 200 tells Stripe the
+    update is applied, and any failure returns a 500 so Stripe retries.
+    Deliveries of an event another delivery already claimed are
+    acknowledged without being processed again.
+    
     Args:
         request: FastAPI request object containing webhook payload
         stripe_signature: Stripe signature header for verification
@@ -145,15 +172,13 @@ async def stripe_webhook_handler(
     Returns:
         HTTP 200 response if successful
     """
-    try:
-        import stripe
-    except ImportError:
+    if stripe is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Stripe module not installed. Please install with: pip install stripe>=7.0.0"
         )
     
-    if not settings.stripe_webhook_secret:
+    if not _STRIPE_WEBHOOK_SECRET:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Stripe webhook secret not configured"
@@ -173,37 +198,51 @@ async def stripe_webhook_handler(
         event = stripe.Webhook.construct_event(
             payload=body,
             sig_header=stripe_signature,
-            secret=settings.stripe_webhook_secret
-        )
-        
-        # Process the event
-        payment_service = get_payment_service()
-        result = await payment_service.handle_webhook_event(event)
-        
-        print(f"Successfully processed Stripe webhook: {event.type}")
-        
-        return Response(
-            content='{"status": "success"}',
-            status_code=200,
-            media_type="application/json"
+            secret=_STRIPE_WEBHOOK_SECRET
         )
         
     except ValueError as e:
         # Invalid payload
-        print(f"Invalid Stripe webhook payload: {e}")
+        logger.warning("Invalid Stripe webhook payload: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid payload"
         )
     except stripe.error.SignatureVerificationError as e:
         # Invalid signature
-        print(f"Invalid Stripe signature: {e}")
+        logger.warning("Invalid Stripe signature: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid signature"
         )
-    except Exception as exc:
-        print(f"Error processing Stripe webhook: {exc}")
+    
+    payment_service = get_payment_service()
+    try:
+        # Skip the event if another delivery of it (on any worker) already
+        # claimed it
+        if not await payment_service.claim_webhook_event(event.id):
+            logger.info("Ignoring redelivered Stripe webhook %s (%s)", event.id, event.type)
+        else:
+            try:
+                await payment_service.handle_webhook_event(event)
+                await payment_service.mark_webhook_event_processed(event.id)
+            except Exception:
+                # Let Stripe's retry of this event claim it again
+                try:
+                    await payment_service.release_webhook_event(event.id)
+                except Exception:
+                    logger.exception("Failed to release Stripe webhook %s", event.id)
+                raise
+            logger.info("Processed Stripe webhook %s (%s)", event.id, event.type)
+        
+        return Response(
+            content='{"status": "success"}',
+            status_code=200,
+            media_type="application/json"
+        )
+        
+    except Exception:
+        logger.exception("Error processing Stripe webhook %s (%s)", event.id, event.type)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process webhook"
@@ -12,10 +12,10 @@ Benefits:
 """
 
 from datetime import datetime
-from typing import Optional, Any
+from typing import Literal, Optional, Any, get_args
 from uuid import UUID
 
-from pydantic import BaseModel, Field, EmailStr, ConfigDict
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator
 
 
 # Application Status Enum
@@ -39,17 +39,46 @@ class ApplicationStatus:
     WITHDRAWN = "withdrawn"
 
 
+# The values of the database's application_status enum as a type, so
+# status fields are checked by pydantic-core itself (one compiled literal
+# lookup) and bad values get a 422 instead of a database enum error. The
+# parser's finer-grained statuses (interview_scheduled, offer_received, ...)
+# aren't in the enum and are mapped onto these before they're stored
+ApplicationStatusValue = Literal[
+    "wishlist",
+    "applied",
+    "screening",
+    "interviewing",
+    "offer",
+    "rejected",
+    "accepted",
+    "withdrawn",
+]
+APPLICATION_STATUSES = frozenset(get_args(ApplicationStatusValue))
+
+
+def _strip_str(value: Any) -> Any:
+    """Strip surrounding whitespace from strings; leave anything else to field validation."""
+    return value.strip() if isinstance(value, str) else value
+
+
 # Application Schemas
 class ApplicationBase(BaseModel):
     """Base schema with fields common to all application operations."""
     company: str = Field(..., min_length=1, max_length=255, description="Company name")
     position: str = Field(..., min_length=1, max_length=255, description="Job title")
-    status: str = Field(default=ApplicationStatus.APPLIED, description="Application status")
+    status: ApplicationStatusValue = Field(default=ApplicationStatus.APPLIED, description="Application status")
     source_url: Optional[str] = Field(None, description="URL to job posting")
     location: Optional[str] = Field(None, description="Job location")
     notes: Optional[str] = Field(None, description="User notes")
     applied_at: Optional[datetime] = Field(None, description="When the application was first received")
 
+    @field_validator("company", "position", mode="before")
+    @classmethod
+    def strip_name(cls, value: Any) -> Any:
+        """Trim surrounding whitespace (before the length checks) so stored names compare cleanly."""
+        return _strip_str(value)
+
 
 class ApplicationCreate(ApplicationBase):
     """Schema for creating a new application (Stage 4)."""
@@ -60,11 +89,24 @@ class ApplicationUpdate(BaseModel):
     """Schema for updating an application (Stage 4)."""
     company: Optional[str] = Field(None, min_length=1, max_length=255)
     position: Optional[str] = Field(None, min_length=1, max_length=255)
-    status: Optional[str] = None
+    status: Optional[ApplicationStatusValue] = None
     source_url: Optional[str] = None
     location: Optional[str] = None
     notes: Optional[str] = None
 
+    @field_validator("company", "position", mode="before")
+    @classmethod
+    def strip_name(cls, value: Any) -> Any:
+        """Trim surrounding whitespace, as on create."""
+        return _strip_str(value)
+
+
+class BulkUpdateItem(BaseModel):
+    """One entry of a bulk update (drag-and-drop reorder / status move)."""
+    id: UUID = Field(..., description="Application ID")
+    status: Optional[ApplicationStatusValue] = Field(None, description="New application status")
+    order_index: Optional[int] = Field(None, description="New position within its status column")
+
 
 class ProfileBase(BaseModel):
     full_name: Optional[str] = None
@@ -176,9 +218,13 @@ class IngestResponse(BaseModel):
 class PaginatedResponse(BaseModel):
     """Generic paginated response wrapper."""
     items: list = Field(..., description="List of items")
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(..., description="Total number of items (an estimate unless with_total is set; None in cursor mode)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Maximum items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Keyset cursor for the next page (only in cursor mode, None on the last page)"
+    )
+    has_more: bool = Field(False, description="Whether another page follows this one")
 
 
 # Health Check Schema
@@ -13,14 +13,43 @@ Why a service layer?
 - Centralizes database queries
 """
 
-from typing import Optional, List, Dict, Any
+import asyncio
+import base64
+import binascii
+import csv
+import io
+from typing import AsyncIterator, Optional, List, Dict, Any
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
+import orjson
+from cachetools import TTLCache
 from fastapi import HTTPException, status
+from psycopg.rows import dict_row
 from supabase import Client
-from app.schemas import ApplicationCreate, ApplicationUpdate
-from app.db import get_supabase_client
+from app.config import settings
+from app.schemas import ApplicationCreate, ApplicationUpdate, BulkUpdateItem
+from app.db import get_db_connection, get_supabase_client
+
+
+# Analytics results per user. Dashboards poll these endpoints, while the
+# underlying data changes rarely, so results are reused for
+# analytics_cache_ttl seconds and dropped whenever the user's applications
+# change (see invalidate_analytics_cache).
+_overview_cache: TTLCache = TTLCache(maxsize=settings.analytics_cache_max, ttl=settings.analytics_cache_ttl)
+_trends_cache: TTLCache = TTLCache(maxsize=settings.analytics_cache_max, ttl=settings.analytics_cache_ttl)  # (user_id, days) -> trends
+_companies_cache: TTLCache = TTLCache(maxsize=settings.analytics_cache_max, ttl=settings.analytics_cache_ttl)
+_sources_cache: TTLCache = TTLCache(maxsize=settings.analytics_cache_max, ttl=settings.analytics_cache_ttl)
+
+
+def invalidate_analytics_cache(user_id: Optional[str]) -> None:
+    """Drop any cached analytics for a user after their applications change."""
+    if not user_id:
+        return
+    for cache in (_overview_cache, _companies_cache, _sources_cache):
+        cache.pop(user_id, None)
+    for key in [key for key in _trends_cache if key[0] == user_id]:
+        _trends_cache.pop(key, None)
 
 
 class ApplicationService:
@@ -73,6 +102,7 @@ class ApplicationService:
                     application_data['user_id'] = "00000000-0000-0000-0000-000000000001"
             
             result = self.supabase.table("applications").insert(application_data).execute()
+            invalidate_analytics_cache(application_data.get("user_id"))
             return result.data[0] if result.data else {}
         except Exception as e:
             print(f"Error creating application: {e}")
@@ -154,6 +184,8 @@ class ApplicationService:
             updates["updated_at"] = datetime.utcnow().isoformat()
             
             result = self.supabase.table("applications").update(updates).eq("id", application_id).execute()
+            if result.data:
+                invalidate_analytics_cache(result.data[0].get("user_id"))
             return result.data[0] if result.data else None
         except Exception as e:
             print(f"Error updating application: {e}")
@@ -163,6 +195,8 @@ class ApplicationService:
         """Delete an application"""
         try:
             result = self.supabase.table("applications").delete().eq("id", application_id).execute()
+            if result.data:
+                invalidate_analytics_cache(result.data[0].get("user_id"))
             return bool(result.data)
         except Exception as e:
             print(f"Error deleting application: {e}")
@@ -205,8 +239,10 @@ class ApplicationService:
             
             if not can_create:
                 # Limit exceeded - raise HTTPException
-                current_count = await subscription_service.get_user_application_count(user_id)
-                subscription = await subscription_service.get_user_subscription(user_id)
+                current_count, subscription = await asyncio.gather(
+                    subscription_service.get_user_application_count(user_id),
+                    subscription_service.get_user_subscription(user_id),
+                )
                 
                 # Safely extract plan data
                 plan = subscription.get("subscription_plans")
@@ -281,8 +317,10 @@ async def create_application(user_id: str, data: ApplicationCreate) -> dict:
     can_create, error_message = await subscription_service.can_create_application(user_id)
 
     if not can_create:
-        current_count = await subscription_service.get_user_application_count(user_id)
-        subscription = await subscription_service.get_user_subscription(user_id)
+        current_count, subscription = await asyncio.gather(
+            subscription_service.get_user_application_count(user_id),
+            subscription_service.get_user_subscription(user_id),
+        )
         plan = subscription.get("subscription_plans", {})
         features = plan.get("features", {})
         limit = features.get("max_applications", 25)
@@ -301,19 +339,12 @@ async def create_application(user_id: str, data: ApplicationCreate) -> dict:
 
     supabase = get_supabase_client()
 
-    app_data = {
-        "user_id": user_id,
-        "company": data.company,
-        "position": data.position,
-        "status": data.status,
-        "source_url": data.source_url,
-        "location": data.location,
-        "notes": data.notes,
-        "applied_at": data.applied_at.isoformat() if data.applied_at and isinstance(data.applied_at, datetime) else data.applied_at,
-    }
+    app_data = _application_row(user_id, data)
 
     try:
-        result = supabase.table("applications").insert(app_data).execute()
+        result = await asyncio.to_thread(
+            supabase.table("applications").insert(app_data).execute
+        )
     except Exception as exc:  # pragma: no cover - log full context for production debugging
         print(
             "Supabase insert exception in create_application:",
@@ -344,34 +375,110 @@ async def create_application(user_id: str, data: ApplicationCreate) -> dict:
     if not result.data:
         raise Exception("Failed to create application: empty response")
 
+    invalidate_analytics_cache(user_id)
     return result.data[0]
 
 
-async def get_user_applications(
-    user_id: str,
-    skip: int = 0,
-    limit: int = 20,
-    status: Optional[str] = None,
-    company: Optional[str] = None,
-    position: Optional[str] = None,
-    source: Optional[str] = None,
-    confidence: Optional[str] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
-    search: Optional[str] = None,
-    sort: Optional[str] = None,
-) -> tuple[list[dict], int]:
+async def create_applications(user_id: str, items: list[ApplicationCreate]) -> list[dict]:
     """
-    Get applications for a user with filtering and pagination.
+    Create several applications for a user with a single insert.
+
+    The subscription limit is checked once for the whole batch. Items are
+    created in order until the limit is reached; the rest are skipped.
+
+    Args:
+        user_id: UUID of the authenticated user
+        items: Application data, in order
+
+    Returns:
+        Created application records, one for each of the first
+        len(result) items
+
+    Raises:
+        Exception: If database operation fails
     """
-    supabase = get_supabase_client()
+    if not items:
+        return []
 
-    query = (
+    from app.services.subscription import get_subscription_service
+
+    remaining, _ = await get_subscription_service().get_application_allowance(user_id)
+    if remaining is not None:
+        items = items[:remaining]
+    if not items:
+        return []
+
+    supabase = get_supabase_client()
+    result = await asyncio.to_thread(
         supabase.table("applications")
-        .select("*", count="exact")
-        .eq("user_id", user_id)
+        .insert([_application_row(user_id, data) for data in items])
+        .execute
     )
 
+    error = getattr(result, "error", None)
+    if error:
+        raise Exception(f"Supabase error creating applications: {error}")
+
+    if not result.data:
+        raise Exception("Failed to create applications: empty response")
+
+    invalidate_analytics_cache(user_id)
+    return result.data
+
+
+def _application_row(user_id: str, data: ApplicationCreate) -> dict:
+    """Build the applications row inserted for new application data."""
+    return {
+        "user_id": user_id,
+        "company": data.company,
+        "position": data.position,
+        "status": data.status,
+        "source_url": data.source_url,
+        "location": data.location,
+        "notes": data.notes,
+        "applied_at": data.applied_at.isoformat() if data.applied_at and isinstance(data.applied_at, datetime) else data.applied_at,
+    }
+
+
+def encode_application_cursor(record: dict) -> str:
+    """Build the opaque keyset cursor that continues after this application."""
+    raw = orjson.dumps([record["created_at"], str(record["id"])])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode_application_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a keyset cursor into (created_at, id).
+
+    Both values are checked (ISO timestamp and UUID) before they are bound
+    into the keyset condition, so a tampered cursor gets a 400 instead of a
+    database error.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        datetime.fromisoformat(created_at)
+        record_id = str(UUID(record_id))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return created_at, record_id
+
+
+def _apply_application_filters(
+    query,
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    source: Optional[str] = None,
+    confidence: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    search: Optional[str] = None,
+):
+    """Add the list/export filters shared by offset and keyset queries."""
     if status:
         query = query.eq("status", status)
     if company:
@@ -385,9 +492,58 @@ async def get_user_applications(
     if search:
         query = query.or_(f"company.ilike.%{search}%,position.ilike.%{search}%")
     if date_from:
-        query = query.gte("applied_at", date_from)
+        query = query.gte("applied_at", date_from.isoformat())
     if date_to:
-        query = query.lte("applied_at", date_to)
+        query = query.lte("applied_at", date_to.isoformat())
+    return query
+
+
+async def get_user_applications(
+    user_id: str,
+    skip: int = 0,
+    limit: int = 20,
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    source: Optional[str] = None,
+    confidence: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    search: Optional[str] = None,
+    sort: Optional[str] = None,
+    count: Optional[str] = "planned",
+) -> tuple[list[dict], int]:
+    """
+    Get applications for a user with filtering and offset pagination.
+
+    Postgres still reads and discards the skipped rows, so deep pages get
+    slower as a user's history grows; get_user_applications_page() avoids
+    that.
+
+    count is the PostgREST count method for the total: "planned" (the
+    default) is the query planner's row estimate and costs nothing extra,
+    "exact" counts every matching row, and None skips the total altogether
+    (it is then returned as 0). An exact total is computed in the same
+    query as the page (see _get_user_applications_with_total).
+    """
+    if count == "exact":
+        return await _get_user_applications_with_total(
+            user_id, skip, limit, sort,
+            *_application_filter_sql(
+                status, company, position, source, confidence, date_from, date_to, search
+            ),
+        )
+
+    supabase = get_supabase_client()
+
+    query = (
+        supabase.table("applications")
+        .select("*", count=count)
+        .eq("user_id", user_id)
+    )
+    query = _apply_application_filters(
+        query, status, company, position, source, confidence, date_from, date_to, search
+    )
 
     # Apply ordering logic
     sort_value = (sort or "updated_desc").lower()
@@ -409,6 +565,149 @@ async def get_user_applications(
     return result.data or [], total
 
 
+def _application_filter_sql(
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    source: Optional[str] = None,
+    confidence: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    search: Optional[str] = None,
+) -> tuple[list[str], list]:
+    """
+    SQL counterpart of _apply_application_filters.
+
+    Returns (conditions, params): WHERE conditions with %s placeholders and
+    their values in order. Only fixed SQL text is generated; every
+    user-supplied value is a bound parameter.
+    """
+    conditions: list[str] = []
+    params: list = []
+    if status:
+        conditions.append("status = %s::application_status")
+        params.append(status)
+    if company:
+        conditions.append("company ILIKE %s")
+        params.append(f"%{company}%")
+    if position:
+        conditions.append("position ILIKE %s")
+        params.append(f"%{position}%")
+    if source:
+        conditions.append("source = %s")
+        params.append(source)
+    if confidence:
+        conditions.append("confidence = %s")
+        params.append(confidence)
+    if search:
+        conditions.append("(company ILIKE %s OR position ILIKE %s)")
+        params.extend([f"%{search}%", f"%{search}%"])
+    if date_from:
+        conditions.append("applied_at >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append("applied_at <= %s")
+        params.append(date_to)
+    return conditions, params
+
+
+async def _get_user_applications_with_total(
+    user_id: str,
+    skip: int,
+    limit: int,
+    sort: Optional[str],
+    conditions: list[str],
+    params: list,
+) -> tuple[list[dict], int]:
+    """
+    Fetch one offset page and the exact number of matching rows in one query.
+
+    PostgREST's count="exact" sends the page and a separate COUNT(*) over
+    the same rows; here count(*) OVER () is evaluated before LIMIT/OFFSET,
+    so the total comes back as a _total column on every row of the page
+    from a single scan. Ordering matches get_user_applications().
+    """
+    where = " AND ".join(["user_id = %s", *conditions])
+    if (sort or "updated_desc").lower() == "applied_desc":
+        order_by = "order_index ASC, applied_at DESC NULLS LAST, created_at DESC"
+    else:
+        order_by = "order_index ASC, updated_at DESC, created_at DESC"
+    query = (
+        f"SELECT *, count(*) OVER () AS _total FROM applications WHERE {where} "
+        f"ORDER BY {order_by} LIMIT %s OFFSET %s"
+    )
+
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, (user_id, *params, limit, skip))
+            rows = await cur.fetchall()
+            if not rows and skip:
+                # Past the last page there's no row to carry the total
+                await cur.execute(
+                    f"SELECT count(*) AS _total FROM applications WHERE {where}",
+                    (user_id, *params),
+                )
+                return [], (await cur.fetchone())["_total"]
+
+    total = rows[0]["_total"] if rows else 0
+    for row in rows:
+        del row["_total"]
+    return rows, total
+
+
+async def get_user_applications_page(
+    user_id: str,
+    cursor: str = "",
+    limit: int = 20,
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    source: Optional[str] = None,
+    confidence: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    search: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Get one keyset page of a user's applications, newest-created first.
+
+    Rows continue after the cursor (an empty cursor starts at the first
+    page) on (created_at, id), so every page is an index seek however deep
+    it is. No total is counted; one extra row is fetched to tell whether
+    another page follows.
+
+    This is the list endpoint's hot path, so it queries Postgres directly
+    over the psycopg pool (where statements are prepared server-side)
+    instead of going through PostgREST.
+
+    Returns:
+        Tuple of (applications, next_cursor); next_cursor is None on the last page
+    """
+    conditions, params = _application_filter_sql(
+        status, company, position, source, confidence, date_from, date_to, search
+    )
+    if cursor:
+        created_at, record_id = _decode_application_cursor(cursor)
+        conditions.append("(created_at, id) < (%s::timestamptz, %s::uuid)")
+        params.extend([created_at, record_id])
+
+    query = "SELECT * FROM applications WHERE user_id = %s"
+    for condition in conditions:
+        query += f" AND {condition}"
+    query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, (user_id, *params, limit + 1))
+            rows = await cur.fetchall()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_application_cursor(page[-1])
+
+
 async def get_applications_grouped_by_status(user_id: str) -> dict[str, list[dict]]:
     """Return applications grouped by status ordered by order_index."""
     supabase = get_supabase_client()
@@ -428,121 +727,154 @@ async def get_applications_grouped_by_status(user_id: str) -> dict[str, list[dic
     return grouped
 
 
-async def export_applications_to_csv(
+CSV_EXPORT_BATCH_SIZE = 500
+
+
+async def iter_applications_csv(
     user_id: str,
     status: Optional[str] = None,
     company: Optional[str] = None,
     position: Optional[str] = None,
     source: Optional[str] = None,
     confidence: Optional[str] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     search: Optional[str] = None,
-    sort: Optional[str] = None,
-) -> str:
-    """Export filtered applications as CSV."""
-    applications, _ = await get_user_applications(
-        user_id=user_id,
-        skip=0,
-        limit=1000,
-        status=status,
-        company=company,
-        position=position,
-        source=source,
-        confidence=confidence,
-        date_from=date_from,
-        date_to=date_to,
-        search=search,
-        sort=sort,
+) -> AsyncIterator[bytes]:
+    """
+    Export filtered applications as CSV, one chunk per batch of rows.
+
+    Applications are fetched CSV_EXPORT_BATCH_SIZE at a time, newest-created
+    first, as keyset pages (see get_user_applications_page), and each batch
+    is written and yielded before the next one is fetched, so memory stays
+    bounded to one batch and the header row goes out immediately. Paging on
+    the unique (created_at, id) key means no row is skipped or repeated
+    between batches, however deep the export goes.
+    """
+    def to_iso(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        return value.split("T")[0] if isinstance(value, str) and "T" in value else value
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def flush() -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    writer.writerow(
+        ["Company", "Position", "Status", "Location", "Source", "Confidence", "Applied At", "Updated At"]
     )
+    yield flush()
 
-    to_iso = lambda value: value.split("T")[0] if isinstance(value, str) and "T" in value else value
-
-    lines = [
-        "Company,Position,Status,Location,Source,Confidence,Applied At,Updated At"
-    ]
-    for app in applications:
-        line = [
-            app.get("company", ""),
-            app.get("position", ""),
-            app.get("status", ""),
-            app.get("location", ""),
-            app.get("source", ""),
-            app.get("confidence", ""),
-            to_iso(app.get("applied_at", "")),
-            to_iso(app.get("updated_at", "")),
-        ]
-        escaped = []
-        for item in line:
-            text = "" if item is None else str(item)
-            if "," in text or "\"" in text:
-                text = text.replace("\"", "\"\"")
-                escaped.append(f'"{text}"')
-            else:
-                escaped.append(text)
-        lines.append(",".join(escaped))
-
-    return "\n".join(lines)
+    cursor = ""
+    while True:
+        applications, cursor = await get_user_applications_page(
+            user_id=user_id,
+            cursor=cursor,
+            limit=CSV_EXPORT_BATCH_SIZE,
+            status=status,
+            company=company,
+            position=position,
+            source=source,
+            confidence=confidence,
+            date_from=date_from,
+            date_to=date_to,
+            search=search,
+        )
+        if not applications:
+            break
+
+        writer.writerows(
+            [
+                app.get("company", ""),
+                app.get("position", ""),
+                app.get("status", ""),
+                app.get("location", ""),
+                app.get("source", ""),
+                app.get("confidence", ""),
+                to_iso(app.get("applied_at", "")),
+                to_iso(app.get("updated_at", "")),
+            ]
+            for app in applications
+        )
+        yield flush()
+
+        if cursor is None:
+            break
+
+
+# One statement for the whole batch: the per-row values arrive as three
+# parallel arrays, so the SQL text (and its plan) is the same for any N
+_BULK_UPDATE_SQL = """
+    UPDATE applications AS a
+    SET status = COALESCE(v.status::application_status, a.status),
+        order_index = COALESCE(v.order_index, a.order_index),
+        updated_at = now()
+    FROM unnest(%s::uuid[], %s::text[], %s::int[]) AS v(id, status, order_index)
+    WHERE a.id = v.id AND a.user_id = %s
+    RETURNING a.*
+"""
 
 
 async def bulk_update_applications(
     user_id: str,
-    updates: list[dict],
+    updates: list[BulkUpdateItem],
 ) -> list[dict]:
-    """Bulk update application order/status values."""
-    if not updates:
-        return []
+    """
+    Bulk update application order/status values.
 
-    supabase = get_supabase_client()
-    payload = []
-    for update in updates:
-        record_id = update.get("id")
-        if not record_id:
-            continue
-        data: dict[str, Any] = {}
-        if "status" in update:
-            data["status"] = update["status"]
-        if "order_index" in update:
-            data["order_index"] = update["order_index"]
-        if not data:
-            continue
-        data["updated_at"] = datetime.utcnow().isoformat()
-        payload.append({"id": record_id, **data})
-
-    if not payload:
+    All items are applied in a single UPDATE ... FROM unnest(...) round-trip
+    (a drag-and-drop reorder typically moves 10-50 cards at once). Rows
+    that don't belong to the user are not touched.
+    """
+    updates = [u for u in updates if u.status is not None or u.order_index is not None]
+    if not updates:
         return []
 
-    result = (
-        supabase.table("applications")
-        .upsert(payload, on_conflict="id")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
+    params = (
+        [u.id for u in updates],
+        [u.status for u in updates],
+        [u.order_index for u in updates],
+        user_id,
     )
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(_BULK_UPDATE_SQL, params)
+            rows = await cur.fetchall()
 
-    return result.data or []
+    invalidate_analytics_cache(user_id)
+    return rows
 
 
 async def get_application_by_id(application_id: str, user_id: str) -> Optional[dict]:
     """
     Get a single application by ID.
     
-    RLS ensures user can only access their own applications.
+    The backend client uses the service role key, which bypasses RLS, so
+    the query filters on user_id itself.
     
     Args:
         application_id: UUID of the application
-        user_id: UUID of the authenticated user (for RLS)
+        user_id: UUID of the authenticated user
         
     Returns:
-        Application record or None if not found
+        Application record or None if not found (or not the user's)
     """
     supabase = get_supabase_client()
     
-    result = (
+    # At most one row; run in a worker thread so the request doesn't block
+    # the event loop while PostgREST answers
+    result = await asyncio.to_thread(
         supabase.table("applications")
         .select("*")
         .eq("id", application_id)
-        .execute()
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute
     )
     
     if not result.data:
@@ -600,12 +932,12 @@ async def update_application(
     update_data["updated_at"] = datetime.utcnow().isoformat()
     
     # Perform update (RLS ensures user can only update their own applications)
-    result = (
+    result = await asyncio.to_thread(
         supabase.table("applications")
         .update(update_data)
         .eq("id", application_id)
         .eq("user_id", user_id)  # Explicitly filter by user_id for security
-        .execute()
+        .execute
     )
     
     if not result.data:
@@ -613,6 +945,7 @@ async def update_application(
         return None
     
     print(f"✅ Successfully updated application {application_id} for user {user_id}")
+    invalidate_analytics_cache(user_id)
     return result.data[0]
 
 
@@ -640,67 +973,95 @@ async def delete_application(application_id: str, user_id: str) -> bool:
     )
     
     # If data is returned, deletion was successful
+    if result.data:
+        invalidate_analytics_cache(user_id)
     return bool(result.data)
 
 
 async def get_analytics_overview(user_id: str) -> dict:
     """Get analytics overview data for dashboard."""
+    cached = _overview_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     supabase = get_supabase_client()
+    month_start = (datetime.now() - timedelta(days=30)).isoformat()
     
-    # Get total applications count
-    total_result = (
-        supabase.table("applications")
-        .select("id", count="exact")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    total_applications = total_result.count or 0
+    # The four queries are independent. The Supabase client is synchronous,
+    # so each runs in a worker thread and they overlap: the endpoint waits
+    # for the slowest query rather than the sum of all four.
+    def count_total() -> int:
+        # Get total applications count
+        result = (
+            supabase.table("applications")
+            .select("id", count="exact")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return result.count or 0
     
-    # Get applications by status
-    status_result = (
-        supabase.table("applications")
-        .select("status")
-        .eq("user_id", user_id)
-        .execute()
+    def fetch_statuses() -> list[dict]:
+        # Get applications by status
+        result = (
+            supabase.table("applications")
+            .select("status")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return result.data or []
+    
+    def count_this_month() -> int:
+        # Get applications this month
+        result = (
+            supabase.table("applications")
+            .select("id", count="exact")
+            .eq("user_id", user_id)
+            .gte("created_at", month_start)
+            .execute()
+        )
+        return result.count or 0
+    
+    def count_responded() -> int:
+        # Get response rate (applications that moved past "applied" status)
+        result = (
+            supabase.table("applications")
+            .select("id", count="exact")
+            .eq("user_id", user_id)
+            .neq("status", "applied")
+            .execute()
+        )
+        return result.count or 0
+    
+    total_applications, status_rows, applications_this_month, responded_count = await asyncio.gather(
+        asyncio.to_thread(count_total),
+        asyncio.to_thread(fetch_statuses),
+        asyncio.to_thread(count_this_month),
+        asyncio.to_thread(count_responded),
     )
     
     status_counts = {}
-    for app in status_result.data or []:
+    for app in status_rows:
         status = app.get("status", "applied")
         status_counts[status] = status_counts.get(status, 0) + 1
     
-    # Get applications this month
-    month_start = (datetime.now() - timedelta(days=30)).isoformat()
-    month_result = (
-        supabase.table("applications")
-        .select("id", count="exact")
-        .eq("user_id", user_id)
-        .gte("created_at", month_start)
-        .execute()
-    )
-    applications_this_month = month_result.count or 0
-    
-    # Get response rate (applications that moved past "applied" status)
-    responded_result = (
-        supabase.table("applications")
-        .select("id", count="exact")
-        .eq("user_id", user_id)
-        .neq("status", "applied")
-        .execute()
-    )
-    responded_count = responded_result.count or 0
     response_rate = (responded_count / total_applications * 100) if total_applications > 0 else 0
     
-    return {
+    overview = {
         "total_applications": total_applications,
         "applications_this_month": applications_this_month,
         "response_rate": round(response_rate, 1),
         "status_counts": status_counts,
     }
+    _overview_cache[user_id] = overview
+    return overview
 
 
 async def get_analytics_trends(user_id: str, days: int = 30) -> dict:
     """Get application trends over time."""
+    cached = _trends_cache.get((user_id, days))
+    if cached is not None:
+        return cached
+
     supabase = get_supabase_client()
     
     start_date = (datetime.now() - timedelta(days=days)).isoformat()
@@ -732,14 +1093,20 @@ async def get_analytics_trends(user_id: str, days: int = 30) -> dict:
         })
         current_date += timedelta(days=1)
     
-    return {
+    trends = {
         "trend_data": trend_data,
         "total_in_period": sum(daily_counts.values()),
     }
+    _trends_cache[(user_id, days)] = trends
+    return trends
 
 
 async def get_analytics_companies(user_id: str) -> dict:
     """Get company analytics data."""
+    cached = _companies_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     supabase = get_supabase_client()
     
     # Get applications grouped by company
@@ -759,15 +1126,21 @@ async def get_analytics_companies(user_id: str) -> dict:
     sorted_companies = sorted(company_counts.items(), key=lambda x: x[1], reverse=True)
     top_companies = sorted_companies[:10]  # Top 10 companies
     
-    return {
+    companies = {
         "company_counts": dict(sorted_companies),
         "top_companies": [{"company": company, "count": count} for company, count in top_companies],
         "unique_companies": len(company_counts),
     }
+    _companies_cache[user_id] = companies
+    return companies
 
 
 async def get_analytics_sources(user_id: str) -> dict:
     """Get application source analytics."""
+    cached = _sources_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     supabase = get_supabase_client()
     
     # Get applications grouped by source
@@ -786,8 +1159,10 @@ async def get_analytics_sources(user_id: str) -> dict:
     # Sort by count
     sorted_sources = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)
     
-    return {
+    sources = {
         "source_counts": dict(sorted_sources),
         "top_sources": [{"source": source, "count": count} for source, count in sorted_sources[:5]],
     }
+    _sources_cache[user_id] = sources
+    return sources
 
@@ -10,14 +10,48 @@ This service handles:
 - Email retrieval and search
 """
 
+import asyncio
+import functools
 import hashlib
 import json
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from psycopg.rows import dict_row
 from supabase import Client
 from app.schemas import EmailIngest
-from app.db import get_supabase_client
+from app.db import get_db_connection, get_supabase_client
+
+
+# Everything email ingestion needs to know before it writes, in one round
+# trip, for each incoming email: the user's application an identical email
+# was already linked to, and the user's application for the same company +
+# position, ignoring case (a NULL company or position matches nothing).
+# Both come back as small JSON objects holding only what the duplicate
+# handling reads, or NULL. Emails linked to other users' applications don't
+# count. One row per email, in the order given.
+_INGEST_LOOKUP_SQL = """
+    SELECT
+        (
+            SELECT jsonb_build_object('id', a.id, 'status', a.status, 'source_url', a.source_url)
+            FROM email_messages AS e
+            JOIN applications AS a ON a.id = e.application_id
+            WHERE e.parsed_data->>'email_hash' = i.email_hash
+              AND a.user_id = %(user_id)s
+            LIMIT 1
+        ) AS app_by_hash,
+        (
+            SELECT jsonb_build_object('id', a.id)
+            FROM applications AS a
+            WHERE a.user_id = %(user_id)s
+              AND lower(a.company) = lower(i.company)
+              AND lower(a.position) = lower(i.position)
+            LIMIT 1
+        ) AS app_by_company_position
+    FROM unnest(%(email_hashes)s::text[], %(companies)s::text[], %(positions)s::text[])
+        WITH ORDINALITY AS i(email_hash, company, position, n)
+    ORDER BY i.n
+"""
 
 
 class EmailService:
@@ -158,12 +192,31 @@ def generate_email_hash(email_data: EmailIngest) -> str:
         if hash1 == hash2:
             print("Duplicate email!")
     """
+    # Only these identity fields are hashed, never the bodies
+    return _hash_email_identity(
+        email_data.sender.lower().strip(),
+        email_data.subject.strip(),
+        # Use date if provided, otherwise use current time
+        email_data.received_at.isoformat() if email_data.received_at else "",
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _hash_email_identity(sender: str, subject: str, received_at: str) -> str:
+    """
+    Hash an email's normalized identity fields.
+    
+    Memoized because the same email is usually hashed more than once in
+    quick succession (the add-on's /ingest/email/test preview followed by
+    /ingest/email, and retries). The canonical JSON and SHA-256 must stay
+    exactly as they are: stored email_messages rows are matched on this
+    value.
+    """
     # Create a canonical representation
     canonical = {
-        "sender": email_data.sender.lower().strip(),
-        "subject": email_data.subject.strip(),
-        # Use date if provided, otherwise use current time
-        "received_at": email_data.received_at.isoformat() if email_data.received_at else "",
+        "sender": sender,
+        "subject": subject,
+        "received_at": received_at,
     }
     
     # Sort keys for consistency
@@ -187,11 +240,13 @@ async def check_duplicate_email(email_hash: str) -> Optional[dict]:
     
     # Note: We're using service role key which bypasses RLS
     # In production, you might want to scope this by user
-    result = (
+    # supabase-py is synchronous; run the request in a worker thread so
+    # concurrent ingestions don't queue behind it on the event loop
+    result = await asyncio.to_thread(
         supabase.table("email_messages")
         .select("*")
         .eq("parsed_data->>email_hash", email_hash)
-        .execute()
+        .execute
     )
     
     if not result.data:
@@ -200,6 +255,65 @@ async def check_duplicate_email(email_hash: str) -> Optional[dict]:
     return result.data[0]
 
 
+async def ingest_lookup(
+    user_id: str,
+    email_hash: str,
+    company: Optional[str],
+    position: Optional[str],
+) -> dict:
+    """
+    Look up both kinds of duplicate for an incoming email in one query.
+    
+    Replaces check_duplicate_email(), get_application_by_id() and a
+    company + position search, which ingestion used to run one after the
+    other, each a separate round trip to Supabase.
+    
+    Args:
+        user_id: UUID of the user ingesting the email
+        email_hash: Hash from generate_email_hash()
+        company: Parsed company name, if any
+        position: Parsed position title, if any
+        
+    Returns:
+        Dict with app_by_hash (id, status, source_url) and
+        app_by_company_position (id only), each None if there's no match
+    """
+    results = await ingest_lookup_many(user_id, [(email_hash, company, position)])
+    return results[0]
+
+
+async def ingest_lookup_many(
+    user_id: str,
+    emails: list[tuple[str, Optional[str], Optional[str]]],
+) -> list[dict]:
+    """
+    Run ingest_lookup() for a batch of emails in one query.
+    
+    Args:
+        user_id: UUID of the user ingesting the emails
+        emails: (email_hash, company, position) for each email
+        
+    Returns:
+        One ingest_lookup() result per email, in the same order
+    """
+    if not emails:
+        return []
+
+    email_hashes, companies, positions = (list(column) for column in zip(*emails))
+    async with get_db_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                _INGEST_LOOKUP_SQL,
+                {
+                    "user_id": user_id,
+                    "email_hashes": email_hashes,
+                    "companies": companies,
+                    "positions": positions,
+                },
+            )
+            return await cur.fetchall()
+
+
 async def store_email_message(
     email_data: EmailIngest,
     application_id: Optional[str] = None,
@@ -223,11 +337,59 @@ async def store_email_message(
         Exception: If database operation fails
     """
     supabase = get_supabase_client()
+    email_record = _email_record(email_data, application_id)
     
+    # Insert into database
+    result = await asyncio.to_thread(
+        supabase.table("email_messages").insert(email_record).execute
+    )
+    
+    if not result.data:
+        raise Exception("Failed to store email message")
+    
+    return result.data[0]
+
+
+async def store_email_messages(
+    emails: list[tuple[EmailIngest, Optional[str]]],
+) -> list[dict]:
+    """
+    Store a batch of email messages with a single insert.
+    
+    Args:
+        emails: (email_data, application_id) for each email; the
+            application ID may be None
+        
+    Returns:
+        Stored email records
+        
+    Raises:
+        Exception: If database operation fails
+    """
+    if not emails:
+        return []
+
+    supabase = get_supabase_client()
+    email_records = [
+        _email_record(email_data, application_id)
+        for email_data, application_id in emails
+    ]
+    
+    result = await asyncio.to_thread(
+        supabase.table("email_messages").insert(email_records).execute
+    )
+    
+    if not result.data:
+        raise Exception("Failed to store email messages")
+    
+    return result.data
+
+
+def _email_record(email_data: EmailIngest, application_id: Optional[str]) -> dict:
+    """Build the email_messages row for an incoming email."""
     # Generate hash for deduplication
     email_hash = generate_email_hash(email_data)
     
-    # Prepare email record
     # Handle received_at: convert datetime to ISO string if needed
     received_at_value = email_data.received_at
     if received_at_value and isinstance(received_at_value, datetime):
@@ -235,7 +397,7 @@ async def store_email_message(
     elif not received_at_value:
         received_at_value = datetime.utcnow().isoformat()
     
-    email_record = {
+    return {
         "application_id": application_id,
         "sender": email_data.sender,
         "subject": email_data.subject,
@@ -250,14 +412,6 @@ async def store_email_message(
             "parsed_status": email_data.parsed_status,
         }
     }
-    
-    # Insert into database
-    result = supabase.table("email_messages").insert(email_record).execute()
-    
-    if not result.data:
-        raise Exception("Failed to store email message")
-    
-    return result.data[0]
 
 
 async def get_application_emails(application_id: str) -> list[dict]:
@@ -23,6 +23,7 @@ This is a simplified parser for MVP. In production, you'd want:
 """
 
 import json
+import logging
 import re
 from typing import Optional, Dict, Any
 
@@ -31,6 +32,8 @@ import httpx
 from app.config import settings
 from app.schemas import EmailIngest
 
+logger = logging.getLogger(__name__)
+
 
 class EmailParser:
     """Email parser for job application emails"""
@@ -101,8 +104,16 @@ class EmailParser:
         
         This is a smart detector that uses OpenAI GPT to understand context and meaning,
         not just keyword matching. This prevents false positives like trading emails.
+        
+        An email is job-related if the AI says so, or if the keyword heuristics
+        do. A "no" from the AI never overrides the keywords, so the local check
+        runs first: when it already says yes, the OpenAI round trip (up to 10s)
+        is skipped and the answer is the same.
         """
-        # Try AI-based detection first (more accurate)
+        if _matches_job_keywords(email_data):
+            return True
+        
+        # Only the AI can still turn this into a job email
         if settings.openai_api_key:
             try:
                 ai_result = detect_job_application_with_ai(
@@ -114,76 +125,78 @@ class EmailParser:
                     ai_decision = ai_result.get("is_job_application", False)
                     if ai_decision is True:
                         return True
-                    # If the AI says "not a job application", fall through and allow
-                    # the keyword-based detector to make the final call. This handles
-                    # cases where the AI is overly strict with rejections.
                     print(
                         "⚠️ AI marked email as non-job-application, "
-                        "falling back to keyword heuristics. Reasoning:",
+                        "and keyword heuristics agree. Reasoning:",
                         ai_result.get("reasoning", "N/A")
                     )
             except Exception as e:
                 print(f"⚠️ AI detection failed, falling back to keyword matching: {e}")
         
-        # Quick exclusion for newsletters / digests to avoid timeouts
-        subject = (email_data.subject or "").lower()
-        sender = (email_data.sender or "").lower()
-        newsletter_senders = {
-            "handshake@",  # Handshake digests
-            "@mail.googlejobs.com",
-            "@mail.handshake.com",
-            "@updates.handshake.com",
-            "@mail.linkedin.com",
-            "@jobcase.com",
-            "@jobs.com",
-            "@ziprecruiter.com",
-        }
-        newsletter_subject_tokens = [
-            "recommended jobs for you",
-            "jobs you may like",
-            "new roles from",
-            "weekly job digest",
-            "job recommendations",
-            "roles hiring now",
-            "popular positions this week",
-            "new matches for you",
-        ]
-        if any(token in sender for token in newsletter_senders) or any(
-            token in subject for token in newsletter_subject_tokens
-        ):
-            print("ℹ️ Newsletter/digest detected, skipping job classification.")
-            return False
-
-        # Fallback to keyword-based detection
-        content = (email_data.subject + " " + (email_data.text_body or "")).lower()
-        
-        # More specific keywords to reduce false positives
-        job_keywords = [
-            'job application', 'application received', 'thank you for applying',
-            'interview', 'job offer', 'position', 'career opportunity',
-            'hiring', 'recruiter', 'candidate', 'resume', 'cv',
-            'employment', 'role', 'we received your application',
-            'next steps', 'schedule interview', 'application status'
-        ]
-        
-        # Also check for rejection keywords to ensure we catch rejections
-        rejection_keywords = [
-            'not selected', 'decided to go with another candidate',
-            'unfortunately', 'not moving forward', 'not the right fit',
-            'have not been selected', 'not been selected',
-            'not been selected for this year', 'will not be moving forward',
-            'we will not be moving forward', 'you have not been selected',
-            'decided to progress with other candidates',
-            'progress with other candidates',
-            'could not move forward with your application',
-            'decision regarding your application',
-            'keep in touch regarding future opportunities',
-        ]
-        
-        has_job_keywords = any(keyword in content for keyword in job_keywords)
-        has_rejection_keywords = any(keyword in content for keyword in rejection_keywords)
-        
-        return has_job_keywords or has_rejection_keywords
+        return False
+
+
+# Newsletter / digest senders and subjects, excluded before keyword matching
+_NEWSLETTER_SENDERS = (
+    "handshake@",  # Handshake digests
+    "@mail.googlejobs.com",
+    "@mail.handshake.com",
+    "@updates.handshake.com",
+    "@mail.linkedin.com",
+    "@jobcase.com",
+    "@jobs.com",
+    "@ziprecruiter.com",
+)
+_NEWSLETTER_SUBJECT_TOKENS = (
+    "recommended jobs for you",
+    "jobs you may like",
+    "new roles from",
+    "weekly job digest",
+    "job recommendations",
+    "roles hiring now",
+    "popular positions this week",
+    "new matches for you",
+)
+
+# More specific keywords to reduce false positives
+_JOB_KEYWORDS = (
+    'job application', 'application received', 'thank you for applying',
+    'interview', 'job offer', 'position', 'career opportunity',
+    'hiring', 'recruiter', 'candidate', 'resume', 'cv',
+    'employment', 'role', 'we received your application',
+    'next steps', 'schedule interview', 'application status'
+)
+
+# Also check for rejection keywords to ensure we catch rejections
+_REJECTION_KEYWORDS = (
+    'not selected', 'decided to go with another candidate',
+    'unfortunately', 'not moving forward', 'not the right fit',
+    'have not been selected', 'not been selected',
+    'not been selected for this year', 'will not be moving forward',
+    'we will not be moving forward', 'you have not been selected',
+    'decided to progress with other candidates',
+    'progress with other candidates',
+    'could not move forward with your application',
+    'decision regarding your application',
+    'keep in touch regarding future opportunities',
+)
+
+
+def _matches_job_keywords(email_data) -> bool:
+    """Keyword-based job email check (no I/O); newsletters and digests never match."""
+    # Quick exclusion for newsletters / digests to avoid timeouts
+    subject = (email_data.subject or "").lower()
+    sender = (email_data.sender or "").lower()
+    if any(token in sender for token in _NEWSLETTER_SENDERS) or any(
+        token in subject for token in _NEWSLETTER_SUBJECT_TOKENS
+    ):
+        logger.debug("Newsletter/digest detected, skipping job classification.")
+        return False
+
+    content = (email_data.subject + " " + (email_data.text_body or "")).lower()
+    return any(keyword in content for keyword in _JOB_KEYWORDS) or any(
+        keyword in content for keyword in _REJECTION_KEYWORDS
+    )
 
 
 def detect_job_application_with_ai(subject: str, sender: str, body: str) -> Optional[Dict[str, Any]]:
@@ -302,6 +315,19 @@ Analyze this email and respond with ONLY a valid JSON object:
         return None
 
 
+# Compiled once at import rather than looked up in re's cache on every email
+_SENDER_DOMAIN_RE = re.compile(r'@([^.]+)')
+_POSITION_AFTER_DASH_RE = re.compile(r' - ([A-Z][A-Za-z\s]+)$')
+_POSITION_AFTER_FOR_RE = re.compile(r' for ([A-Z][A-Za-z\s]+)')
+_POSITION_BEFORE_POSITION_RE = re.compile(r' to ([A-Z][A-Za-z\s]+) position', re.IGNORECASE)
+
+# Sender domains that are recruiting platforms or generic mail, not the employer
+_RECRUITING_PLATFORMS = frozenset({
+    'greenhouse', 'lever', 'workday', 'taleo', 'smartrecruiters',
+    'indeed', 'linkedin', 'glassdoor', 'monster', 'gmail', 'outlook'
+})
+
+
 def extract_company_from_sender(sender: str) -> Optional[str]:
     """
     Extract company name from sender email address.
@@ -318,19 +344,14 @@ def extract_company_from_sender(sender: str) -> Optional[str]:
         Company name or None
     """
     # Extract domain from email
-    match = re.search(r'@([^.]+)', sender.lower())
+    match = _SENDER_DOMAIN_RE.search(sender.lower())
     if not match:
         return None
     
     domain = match.group(1)
     
     # Ignore recruiting platforms and generic domains
-    recruiting_platforms = {
-        'greenhouse', 'lever', 'workday', 'taleo', 'smartrecruiters',
-        'indeed', 'linkedin', 'glassdoor', 'monster', 'gmail', 'outlook'
-    }
-    
-    if domain in recruiting_platforms:
+    if domain in _RECRUITING_PLATFORMS:
         return None
     
     # Capitalize and return
@@ -353,17 +374,17 @@ def extract_position_from_subject(subject: str) -> Optional[str]:
         Position title or None
     """
     # Pattern 1: "... - Position Title"
-    match = re.search(r' - ([A-Z][A-Za-z\s]+)$', subject)
+    match = _POSITION_AFTER_DASH_RE.search(subject)
     if match:
         return match.group(1).strip()
     
     # Pattern 2: "... for Position Title"
-    match = re.search(r' for ([A-Z][A-Za-z\s]+)', subject)
+    match = _POSITION_AFTER_FOR_RE.search(subject)
     if match:
         return match.group(1).strip()
     
     # Pattern 3: "... to Position Title"
-    match = re.search(r' to ([A-Z][A-Za-z\s]+) position', subject, re.IGNORECASE)
+    match = _POSITION_BEFORE_POSITION_RE.search(subject)
     if match:
         return match.group(1).strip()
     
@@ -479,36 +500,31 @@ def parse_job_application_email(email_data: EmailIngest) -> dict:
         result = parse_job_application_email(email)
         # -> {"company": "Acme", "position": "Software Engineer", ...}
     """
-    # Use pre-parsed data if available (from Gmail add-on)
-    if email_data.parsed_company:
-        company = email_data.parsed_company
+    # Use pre-parsed data if available (from Gmail add-on). Trimmed here,
+    # once, so the duplicate lookup and the created application agree
+    if email_data.parsed_company and email_data.parsed_company.strip():
+        company = email_data.parsed_company.strip()
     else:
         company = extract_company_from_sender(email_data.sender)
     
-    if email_data.parsed_position:
-        position = email_data.parsed_position
+    if email_data.parsed_position and email_data.parsed_position.strip():
+        position = email_data.parsed_position.strip()
     else:
         position = extract_position_from_subject(email_data.subject)
     
     # Use AI-detected status if available, otherwise fall back to parsed status or content analysis
-    print(f"DEBUG: Checking for detected_status...")
-    print(f"DEBUG: hasattr(email_data, 'detected_status'): {hasattr(email_data, 'detected_status')}")
-    if hasattr(email_data, 'detected_status'):
-        print(f"DEBUG: detected_status value: '{email_data.detected_status}' (type: {type(email_data.detected_status)})")
-        print(f"DEBUG: detected_status is truthy: {bool(email_data.detected_status)}")
-    
     if hasattr(email_data, 'detected_status') and email_data.detected_status:
         status = email_data.detected_status
-        print(f"✅ Using AI-detected status: {status}")
+        logger.debug("Using AI-detected status: %s", status)
     elif hasattr(email_data, 'parsed_status') and email_data.parsed_status:
         status = email_data.parsed_status
-        print(f"Using parsed status: {status}")
+        logger.debug("Using parsed status: %s", status)
     else:
         status = detect_status_from_content(
             email_data.subject,
             email_data.text_body
         )
-        print(f"Using content analysis status: {status}")
+        logger.debug("Using content analysis status: %s", status)
     
     # Build result
     email_source_url = None
@@ -7,6 +7,7 @@ Handles Stripe payment processing including:
 - Syncing subscription status from Stripe
 """
 
+import asyncio
 import os
 from typing import Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
@@ -25,6 +26,7 @@ except ImportError:
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.db import get_db_connection
 from app.services.subscription import get_subscription_service
 
 
@@ -37,6 +39,23 @@ elif not settings.stripe_secret_key:
     print("WARNING: STRIPE_SECRET_KEY not set - payment features will be disabled")
 
 
+# Claim a Stripe event for processing: inserts its ID unless a delivery of
+# the same event already did, or takes over an unprocessed claim that has
+# gone stale, pruning claims past Stripe's retry window
+_CLAIM_WEBHOOK_EVENT_SQL = """
+    WITH pruned AS (
+        DELETE FROM stripe_webhook_events
+        WHERE claimed_at < NOW() - INTERVAL '7 days'
+    )
+    INSERT INTO stripe_webhook_events (event_id)
+    VALUES (%s)
+    ON CONFLICT (event_id) DO UPDATE SET claimed_at = NOW()
+    WHERE stripe_webhook_events.processed_at IS NULL
+      AND stripe_webhook_events.claimed_at < NOW() - INTERVAL '5 minutes'
+    RETURNING event_id
+"""
+
+
 class PaymentService:
     """Service for handling Stripe payment operations."""
     
@@ -102,7 +121,10 @@ class PaymentService:
             # Note: If you have Stripe Price IDs stored in your database, use them instead
             # For now, we'll create a one-time payment that can be converted to subscription
             
-            checkout_session = stripe.checkout.Session.create(
+            # stripe-python is synchronous; the request (often several
+            # hundred ms) runs in a worker thread, not on the event loop
+            checkout_session = await asyncio.to_thread(
+                stripe.checkout.Session.create,
                 payment_method_types=["card"],
                 line_items=[
                     {
@@ -158,6 +180,41 @@ class PaymentService:
                 detail=f"Failed to create checkout session: {str(e)}"
             )
     
+    async def claim_webhook_event(self, event_id: str) -> bool:
+        """
+        Claim a Stripe event so it's processed only once.
+        
+        Stripe delivers at least once and retries (sometimes concurrently),
+        so every delivery tries to claim the event ID; only the first
+        succeeds, whichever worker it reaches. A claim not marked processed
+        within a few minutes is treated as abandoned and can be claimed
+        again.
+        
+        Returns:
+            True if this delivery should process the event
+        """
+        async with get_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_CLAIM_WEBHOOK_EVENT_SQL, (event_id,))
+                return await cur.fetchone() is not None
+    
+    async def mark_webhook_event_processed(self, event_id: str) -> None:
+        """Record that a claimed event was applied, so it's never reclaimed."""
+        async with get_db_connection() as conn:
+            await conn.execute(
+                "UPDATE stripe_webhook_events SET processed_at = NOW() WHERE event_id = %s",
+                (event_id,),
+            )
+    
+    async def release_webhook_event(self, event_id: str) -> None:
+        """Drop a claim after processing failed, so a redelivery can try again."""
+        async with get_db_connection() as conn:
+            await conn.execute(
+                "DELETE FROM stripe_webhook_events"
+                " WHERE event_id = %s AND processed_at IS NULL",
+                (event_id,),
+            )
+    
     async def handle_webhook_event(self, event: Any) -> Dict[str, Any]:
         """
         Process a Stripe webhook event.
@@ -216,16 +273,17 @@ class PaymentService:
         # Get subscription from Stripe
         subscription_id = session.get("subscription")
         if subscription_id:
-            subscription = stripe.Subscription.retrieve(subscription_id)
+            subscription = await asyncio.to_thread(stripe.Subscription.retrieve, subscription_id)
             
             # Ensure subscription has the user_id in metadata
             if not subscription.get("metadata", {}).get("user_id"):
                 print(f"Updating subscription {subscription_id} with user_id metadata")
-                stripe.Subscription.modify(
+                # modify() returns the updated subscription; no need to retrieve it again
+                subscription = await asyncio.to_thread(
+                    stripe.Subscription.modify,
                     subscription_id,
-                    metadata={"user_id": user_id, "plan_id": plan_id}
+                    metadata={"user_id": user_id, "plan_id": plan_id},
                 )
-                subscription = stripe.Subscription.retrieve(subscription_id)
             
             await self.update_subscription_from_stripe(subscription)
         else:
@@ -342,18 +400,18 @@ class PaymentService:
         """
         try:
             # Query user_subscriptions table for this Stripe customer ID
-            result = (
+            result = await asyncio.to_thread(
                 self.subscription_service.supabase.table("user_subscriptions")
                 .select("user_id")
                 .eq("stripe_customer_id", customer_id)
-                .execute()
+                .execute
             )
             
             if result.data and len(result.data) > 0:
                 return result.data[0].get("user_id")
             
             # If not found, try to get from Stripe customer metadata
-            customer = stripe.Customer.retrieve(customer_id)
+            customer = await asyncio.to_thread(stripe.Customer.retrieve, customer_id)
             user_id = customer.get("metadata", {}).get("user_id")
             
             return user_id
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 from datetime import datetime
 
+from cachetools import TTLCache
+
+from app.config import settings
 from app.db import get_supabase_client
 
+# Users known to have a profile row. Email ingestion checks this on every
+# email, and profiles are never deleted, so a hit skips the lookup entirely
+_known_profiles: TTLCache = TTLCache(
+    maxsize=settings.profile_exists_cache_max, ttl=settings.profile_exists_cache_ttl
+)
+
 
 async def get_profile(user_id: str) -> Optional[dict]:
     supabase = get_supabase_client()
-    result = (
+    # Run the synchronous supabase-py request in a worker thread so the
+    # event loop keeps serving other requests meanwhile
+    result = await asyncio.to_thread(
         supabase.table("profiles")
         .select(
             "id, email, full_name, profession, phone, notification_email, job_preferences, created_at, updated_at"
         )
         .eq("id", user_id)
-        .execute()
+        .execute
     )
 
     if not result.data:
@@ -24,17 +36,40 @@ async def get_profile(user_id: str) -> Optional[dict]:
     return result.data[0]
 
 
+async def ensure_profile(user_id: str) -> bool:
+    """
+    Make sure the user has a profile row, creating a default one if needed.
+    
+    Returns True if a profile had to be created.
+    """
+    if user_id in _known_profiles:
+        return False
+    
+    created = await get_profile(user_id) is None
+    if created:
+        await create_default_profile(user_id)
+    _known_profiles[user_id] = True
+    return created
+
+
 async def update_profile(user_id: str, data: dict) -> Optional[dict]:
+    """
+    Update the given profile fields and return the updated profile.
+    
+    Every key in data is written, so callers pass only the fields being
+    set (the router dumps the request with exclude_unset/exclude_none).
+    Returns None if the user has no profile.
+    """
     supabase = get_supabase_client()
-    payload = {key: value for key, value in data.items() if value is not None}
-    payload["updated_at"] = datetime.utcnow().isoformat()
+    payload = {**data, "updated_at": datetime.utcnow().isoformat()}
 
     try:
-        response = (
+        # PostgREST returns the updated row, so it isn't read back separately
+        response = await asyncio.to_thread(
             supabase.table("profiles")
             .update(payload)
             .eq("id", user_id)
-            .execute()
+            .execute
         )
     except Exception as exc:  # pragma: no cover - debug logging for production issues
         print(f"Failed to update profile for user {user_id}: {exc}")
@@ -46,8 +81,7 @@ async def update_profile(user_id: str, data: dict) -> Optional[dict]:
         )
         return None
 
-    # Always fetch the latest profile after updating to ensure we return a complete record
-    return await get_profile(user_id)
+    return response.data[0] if response.data else None
 
 
 async def create_default_profile(user_id: str) -> dict:
@@ -56,7 +90,7 @@ async def create_default_profile(user_id: str) -> dict:
     
     # Try to get user email from Supabase auth admin API
     try:
-        user_response = supabase.auth.admin.get_user_by_id(user_id)
+        user_response = await asyncio.to_thread(supabase.auth.admin.get_user_by_id, user_id)
         user_email = user_response.user.email if user_response.user else f"{user_id}@trackmail.app"
     except Exception as e:
         print(f"Could not fetch user email: {e}")
@@ -80,7 +114,7 @@ async def create_default_profile(user_id: str) -> dict:
     
     # Try to insert, if it fails due to duplicate, try to fetch existing profile
     try:
-        result = supabase.table("profiles").insert(profile_data).execute()
+        result = await asyncio.to_thread(supabase.table("profiles").insert(profile_data).execute)
         if not result.data:
             raise Exception("Failed to create default profile")
         return result.data[0]
@@ -99,7 +133,7 @@ async def create_profile_with_data(user_id: str, profile_data: dict) -> dict:
     
     # Try to get user email from Supabase auth admin API
     try:
-        user_response = supabase.auth.admin.get_user_by_id(user_id)
+        user_response = await asyncio.to_thread(supabase.auth.admin.get_user_by_id, user_id)
         user_email = user_response.user.email if user_response.user else f"{user_id}@trackmail.app"
     except Exception as e:
         print(f"Could not fetch user email: {e}")
@@ -124,7 +158,9 @@ async def create_profile_with_data(user_id: str, profile_data: dict) -> dict:
     
     # Try to insert, if it fails due to duplicate, try to fetch and update existing profile
     try:
-        result = supabase.table("profiles").insert(full_profile_data).execute()
+        result = await asyncio.to_thread(
+            supabase.table("profiles").insert(full_profile_data).execute
+        )
         if not result.data:
             raise Exception("Failed to create profile with signup data")
         return result.data[0]
@@ -10,9 +10,88 @@ This service handles:
 - Feature access control
 """
 
+import asyncio
+import logging
 from typing import Optional, Dict, Any, Tuple
 
-from app.db import get_supabase_client
+from cachetools import TTLCache
+from psycopg.rows import dict_row
+
+from app.config import settings
+from app.db import get_db_connection, get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+# Feature access results, keyed by (user_id, feature_name). Read and written
+# by check_feature_access so gated requests don't query the subscription
+# tables every time; dropped for a user whenever their subscription changes.
+_feature_access_cache: TTLCache = TTLCache(
+    maxsize=settings.feature_access_cache_max, ttl=settings.feature_access_cache_ttl
+)
+
+
+def invalidate_feature_access_cache(user_id: Optional[str]) -> None:
+    """Drop any cached feature access results for a user after their subscription changes."""
+    if not user_id:
+        return
+    for key in [key for key in _feature_access_cache if key[0] == user_id]:
+        _feature_access_cache.pop(key, None)
+
+
+# Each user's subscription with its plan, keyed by user_id. Read by the
+# status endpoint and feature checks; application limit checks always read
+# it fresh. Every change goes through create_or_update_subscription
+# (including the Stripe webhooks), which drops the entry, but only in the
+# worker that made the change: other workers and instances keep serving
+# the old plan until their entry expires, so the TTL is kept short.
+_subscription_cache: TTLCache = TTLCache(
+    maxsize=settings.feature_access_cache_max, ttl=settings.subscription_cache_ttl
+)
+
+
+def invalidate_subscription_cache(user_id: Optional[str]) -> None:
+    """
+    Drop a user's cached subscription and feature access results after it changes.
+    
+    Only this process's caches are cleared; other workers pick the change up
+    within settings.subscription_cache_ttl seconds.
+    """
+    if user_id:
+        _subscription_cache.pop(user_id, None)
+    invalidate_feature_access_cache(user_id)
+
+
+# Subscription plan definitions, keyed by "all", ("name", plan_name) or
+# ("id", plan_id). Plans only change through migrations or the Supabase
+# dashboard, yet every limit check and /subscription/plans request reads
+# them; call invalidate_plans_cache() after editing them in place.
+_plans_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.plans_cache_ttl)
+
+
+def invalidate_plans_cache() -> None:
+    """Drop all cached subscription plans after they're edited."""
+    _plans_cache.clear()
+
+
+# The user's active subscription, shaped like get_user_subscription's
+# Supabase join (plan nested under subscription_plans, NULL if the plan row
+# is gone), and their application count.
+_SUBSCRIPTION_STATUS_SQL = """
+    SELECT
+        (
+            SELECT to_jsonb(s) || jsonb_build_object('subscription_plans', to_jsonb(p))
+            FROM user_subscriptions AS s
+            LEFT JOIN subscription_plans AS p ON p.id = s.plan_id
+            WHERE s.user_id = %(user_id)s
+              AND s.status = 'active'
+            LIMIT 1
+        ) AS subscription,
+        (
+            SELECT count(*)
+            FROM applications
+            WHERE user_id = %(user_id)s
+        ) AS applications_count
+"""
 
 
 class SubscriptionService:
@@ -23,13 +102,25 @@ class SubscriptionService:
 
     async def get_user_subscription(self, user_id: str) -> Dict[str, Any]:
         """Get user's active subscription with plan details."""
+        subscription = _subscription_cache.get(user_id)
+        if subscription is not None:
+            return subscription
+
+        subscription = await self._fetch_user_subscription(user_id)
+        _subscription_cache[user_id] = subscription
+        return subscription
+
+    async def _fetch_user_subscription(self, user_id: str) -> Dict[str, Any]:
+        """Read the user's active subscription (or the free default) from Supabase."""
         try:
-            result = (
+            # Run in a worker thread so it can overlap other lookups
+            # (see can_create_application)
+            result = await asyncio.to_thread(
                 self.supabase.table("user_subscriptions")
                 .select("*, subscription_plans(*)")
                 .eq("user_id", user_id)
                 .eq("status", "active")
-                .execute()
+                .execute
             )
 
             if result.data and len(result.data) > 0:
@@ -57,76 +148,144 @@ class SubscriptionService:
                 return subscription
 
             # No subscription found - return free plan default
-            free_plan = await self.get_subscription_plan("free")
-            if not free_plan:
-                raise Exception("Free plan not found in database - database migration may not have run")
-            
-            return {
-                "user_id": user_id,
-                "plan_id": free_plan["id"],
-                "status": "active",
-                "subscription_plans": free_plan,
-            }
+            return await self._free_subscription(user_id)
 
-        except Exception as exc:
-            print(f"Error getting user subscription: {exc}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+        except Exception:
+            logger.exception("Error getting user subscription")
             raise
 
+    async def _free_subscription(self, user_id: str) -> Dict[str, Any]:
+        """The subscription users without an active one are treated as having."""
+        free_plan = await self.get_subscription_plan("free")
+        if not free_plan:
+            raise Exception("Free plan not found in database - database migration may not have run")
+        
+        return {
+            "user_id": user_id,
+            "plan_id": free_plan["id"],
+            "status": "active",
+            "subscription_plans": free_plan,
+        }
+
+    async def get_subscription_status(self, user_id: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Return the user's subscription (as get_user_subscription) and application count.
+        
+        When the subscription isn't cached, both come from one query instead
+        of two separate Supabase requests.
+        """
+        subscription = _subscription_cache.get(user_id)
+        if subscription is not None:
+            return subscription, await self.get_user_application_count(user_id)
+
+        async with get_db_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(_SUBSCRIPTION_STATUS_SQL, {"user_id": user_id})
+                row = await cur.fetchone()
+
+        subscription = row["subscription"]
+        if subscription is None:
+            subscription = await self._free_subscription(user_id)
+        elif subscription.get("subscription_plans") is None:
+            # Plan row missing - same fallback as get_user_subscription
+            subscription["subscription_plans"] = await self.get_subscription_plan("free")
+        _subscription_cache[user_id] = subscription
+        return subscription, row["applications_count"]
+
     async def get_subscription_plan(self, plan_name: str) -> Optional[Dict[str, Any]]:
         """Get subscription plan details by name."""
+        key = ("name", plan_name)
+        plan = _plans_cache.get(key)
+        if plan is not None:
+            return plan
+
         try:
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.table("subscription_plans")
                 .select("*")
                 .eq("name", plan_name)
                 .eq("is_active", True)
-                .execute()
+                .execute
             )
 
-            return result.data[0] if result.data else None
-
-        except Exception as exc:
-            print(f"Error getting subscription plan: {exc}")
+        except Exception:
+            logger.exception("Error getting subscription plan %s", plan_name)
             raise
 
+        if not result.data:
+            return None
+        _plans_cache[key] = result.data[0]
+        return result.data[0]
+
     async def get_subscription_plan_by_id(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Get subscription plan details by ID."""
+        key = ("id", plan_id)
+        plan = _plans_cache.get(key)
+        if plan is not None:
+            return plan
+
         try:
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.table("subscription_plans")
                 .select("*")
                 .eq("id", plan_id)
-                .execute()
+                .execute
             )
 
-            return result.data[0] if result.data else None
-
-        except Exception as exc:
-            print(f"Error getting subscription plan by ID: {exc}")
+        except Exception:
+            logger.exception("Error getting subscription plan by ID %s", plan_id)
             raise
 
+        if not result.data:
+            return None
+        _plans_cache[key] = result.data[0]
+        return result.data[0]
+
     async def get_user_application_count(self, user_id: str) -> int:
         """Count the number of applications a user has created."""
         try:
-            result = (
-                self.supabase.table("applications")
-                .select("id", count="exact")
-                .eq("user_id", user_id)
-                .execute()
-            )
-
-            return result.count or 0
-
-        except Exception as exc:
-            print(f"Error counting user applications: {exc}")
+            # A pooled count(*) instead of a PostgREST count="exact" request,
+            # which also sends back the id of every application
+            async with get_db_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "SELECT count(*) FROM applications WHERE user_id = %s", (user_id,)
+                    )
+                    (count,) = await cur.fetchone()
+            return count
+
+        except Exception:
+            logger.exception("Error counting applications for %s", user_id)
             raise
 
     async def can_create_application(self, user_id: str) -> Tuple[bool, Optional[str]]:
         """Check whether the user can create another application."""
+        remaining, error_message = await self.get_application_allowance(user_id)
+        return remaining is None or remaining > 0, error_message
+
+    async def get_application_allowance(self, user_id: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Return how many more applications the user may create.
+        
+        The first item is None for unlimited plans and 0 when no more are
+        allowed, in which case the second item explains why. Lets batch
+        ingestion check the limit once for many applications.
+        
+        The subscription is read fresh rather than from the cache, so a
+        plan change made through another worker applies immediately.
+        """
         try:
-            subscription = await self.get_user_subscription(user_id)
+            # The subscription and the application count don't depend on
+            # each other, so fetch them concurrently. A failed count only
+            # matters (and is only raised) if the plan has a limit.
+            subscription, current_count = await asyncio.gather(
+                self._fetch_user_subscription(user_id),
+                self.get_user_application_count(user_id),
+                return_exceptions=True,
+            )
+            if isinstance(subscription, BaseException):
+                raise subscription
+            _subscription_cache[user_id] = subscription
             
             # Safely extract plan data
             plan = subscription.get("subscription_plans")
@@ -135,21 +294,21 @@ class SubscriptionService:
                 plan = await self.get_subscription_plan("free")
                 if not plan:
                     # If free plan doesn't exist, fail securely (deny access)
-                    return False, "Subscription system error - please contact support"
+                    return 0, "Subscription system error - please contact support"
             
             # Handle case where plan might be a dict already
             if isinstance(plan, dict):
                 features = plan.get("features", {})
             else:
                 # If it's not a dict, something went wrong
-                print(f"Warning: plan is not a dict: {type(plan)}")
+                logger.warning("Subscription plan is not a dict: %s", type(plan))
                 # Default to free plan limits
                 free_plan = await self.get_subscription_plan("free")
                 features = free_plan.get("features", {}) if free_plan else {}
 
             # Check for unlimited applications
             if features.get("unlimited_applications"):
-                return True, None
+                return None, None
 
             # Get max applications limit
             max_applications = features.get("max_applications")
@@ -157,73 +316,94 @@ class SubscriptionService:
                 # If max_applications is None and not unlimited, default to 25 (free tier)
                 max_applications = 25
 
-            # Get current application count
-            current_count = await self.get_user_application_count(user_id)
+            # Current application count (fetched above)
+            if isinstance(current_count, BaseException):
+                raise current_count
 
             # Check if limit is exceeded
             if current_count >= max_applications:
-                return False, (
+                return 0, (
                     f"You've reached your limit of {max_applications} applications. "
                     "Upgrade to Pro for unlimited applications and automatic tracking."
                 )
 
-            return True, None
+            return max_applications - current_count, None
 
         except Exception as exc:
             # CRITICAL: Don't bypass limits on errors - fail securely
-            print(f"Error checking application creation permission: {exc}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-            # Return False to deny access on errors (fail-secure)
-            return False, f"Unable to verify subscription limits. Please try again or contact support. Error: {str(exc)}"
+            logger.exception("Error checking application creation permission")
+            # Allow nothing on errors (fail-secure)
+            return 0, f"Unable to verify subscription limits. Please try again or contact support. Error: {str(exc)}"
 
     async def check_feature_access(self, user_id: str, feature_name: str) -> bool:
-        """Return True if the user has access to the given feature."""
+        """
+        Return True if the user has access to the given feature.
+        
+        Results are cached per (user_id, feature_name) for
+        settings.feature_access_cache_ttl seconds; changing a user's
+        subscription clears their entries. Errors deny access and aren't
+        cached.
+        """
+        cache_key = (user_id, feature_name)
+        has_access = _feature_access_cache.get(cache_key)
+        if has_access is not None:
+            return has_access
+
         try:
-            subscription = await self.get_user_subscription(user_id)
-            
-            # Safely extract plan data
-            plan = subscription.get("subscription_plans")
+            has_access = await self._plan_has_feature(user_id, feature_name)
+        except Exception:
+            logger.exception("Error checking feature access")
+            # Fail-secure: deny feature access on errors
+            return False
+
+        _feature_access_cache[cache_key] = has_access
+        return has_access
+
+    async def _plan_has_feature(self, user_id: str, feature_name: str) -> bool:
+        """Look the feature up in the user's current plan."""
+        subscription = await self.get_user_subscription(user_id)
+        
+        # Safely extract plan data
+        plan = subscription.get("subscription_plans")
+        if not plan:
+            # If no plan found, default to free plan (no features)
+            plan = await self.get_subscription_plan("free")
             if not plan:
-                # If no plan found, default to free plan (no features)
-                plan = await self.get_subscription_plan("free")
-                if not plan:
-                    return False
-            
-            # Handle case where plan might be a dict already
-            if isinstance(plan, dict):
-                features = plan.get("features", {})
-            else:
-                # If it's not a dict, something went wrong - deny access
-                print(f"Warning: plan is not a dict in check_feature_access: {type(plan)}")
                 return False
-            
-            return bool(features.get(feature_name, False))
-
-        except Exception as exc:
-            print(f"Error checking feature access: {exc}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-            # Fail-secure: deny feature access on errors
+        
+        # Handle case where plan might be a dict already
+        if isinstance(plan, dict):
+            features = plan.get("features", {})
+        else:
+            # If it's not a dict, something went wrong - deny access
+            logger.warning("Subscription plan is not a dict in check_feature_access: %s", type(plan))
             return False
+        
+        return bool(features.get(feature_name, False))
 
     async def get_all_plans(self) -> list[Dict[str, Any]]:
         """Return all active subscription plans."""
+        plans = _plans_cache.get("all")
+        if plans is not None:
+            return plans
+
         try:
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.table("subscription_plans")
                 .select("*")
                 .eq("is_active", True)
                 .order("price_monthly")
-                .execute()
+                .execute
             )
 
-            return result.data or []
-
-        except Exception as exc:
-            print(f"Error getting all plans: {exc}")
+        except Exception:
+            logger.exception("Error getting all plans")
             raise
 
+        plans = result.data or []
+        _plans_cache["all"] = plans
+        return plans
+
     async def create_or_update_subscription(
         self,
         user_id: str,
@@ -267,13 +447,15 @@ class SubscriptionService:
                     .execute()
                 )
 
+            invalidate_subscription_cache(user_id)
+
             if result.data:
                 return result.data[0]
 
             raise Exception("Failed to create or update subscription")
 
-        except Exception as exc:
-            print(f"Error creating/updating subscription: {exc}")
+        except Exception:
+            logger.exception("Error creating/updating subscription for %s", user_id)
             raise
 
 
@@ -0,0 +1,18 @@
+--
+-- Migration: 0012_hash_api_keys.sql
+-- Purpose: Look API keys up by a fixed-size SHA-256 hash instead of the raw key text
+--
+
+BEGIN;
+
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS api_key_hash BYTEA;
+
+-- Backfill hashes for keys issued before this migration
+UPDATE api_keys
+SET api_key_hash = sha256(convert_to(api_key, 'UTF8'))
+WHERE api_key_hash IS NULL;
+
+-- 32-byte btree lookups used by API-key authentication
+CREATE UNIQUE INDEX IF NOT EXISTS idx_api_keys_key_hash ON api_keys(api_key_hash);
+
+COMMIT;
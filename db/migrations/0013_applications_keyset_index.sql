@@ -0,0 +1,13 @@
+--
+-- Migration: 0013_applications_keyset_index.sql
+-- Purpose: Support keyset (cursor) pagination of a user's applications
+--
+
+BEGIN;
+
+-- Matches ORDER BY created_at DESC, id DESC with the (created_at, id)
+-- cursor predicate, so each page is a single index range scan
+CREATE INDEX IF NOT EXISTS idx_applications_user_created_id
+ON applications(user_id, created_at DESC, id DESC);
+
+COMMIT;
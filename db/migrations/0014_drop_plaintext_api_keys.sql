@@ -0,0 +1,20 @@
+--
+-- Migration: 0014_drop_plaintext_api_keys.sql
+-- Purpose: Keep only the SHA-256 hash of each API key; stop storing the raw key
+--
+
+BEGIN;
+
+-- Hash any key written between 0012 and this migration without one
+UPDATE api_keys
+SET api_key_hash = sha256(convert_to(api_key, 'UTF8'))
+WHERE api_key_hash IS NULL;
+
+ALTER TABLE api_keys ALTER COLUMN api_key_hash SET NOT NULL;
+
+-- The raw key (and its text index) is no longer read or written;
+-- authentication looks keys up through idx_api_keys_key_hash only
+DROP INDEX IF EXISTS idx_api_keys_key;
+ALTER TABLE api_keys DROP COLUMN IF EXISTS api_key;
+
+COMMIT;
@@ -0,0 +1,18 @@
+--
+-- Migration: 0015_api_keys_user_created_index.sql
+-- Purpose: Serve the API key listing from an index-only scan
+--
+
+BEGIN;
+
+-- Matches list_api_keys: WHERE user_id = ? ORDER BY created_at DESC, selecting
+-- only the INCLUDEd columns, so rows come back already sorted without
+-- touching the heap
+CREATE INDEX IF NOT EXISTS idx_api_keys_user_created
+ON api_keys(user_id, created_at DESC)
+INCLUDE (id, name, last_used_at, expires_at);
+
+-- Covered by the index above (same leading column)
+DROP INDEX IF EXISTS idx_api_keys_user_id;
+
+COMMIT;
@@ -0,0 +1,17 @@
+--
+-- Migration: 0016_ingest_dedup_indexes.sql
+-- Purpose: Index the same-email duplicate check run by email ingestion (ingest_lookup)
+--
+
+BEGIN;
+
+-- The other check, same company + position for a user, is indexed in 0017
+-- (it compares lower(company) and lower(position))
+
+-- Same email: the hash lives in parsed_data, so index the expression the
+-- lookup filters on. Not UNIQUE: unlinked emails have always been stored
+-- again on re-ingestion, and identical emails may reach different users
+CREATE INDEX IF NOT EXISTS idx_email_messages_email_hash
+ON email_messages((parsed_data->>'email_hash'));
+
+COMMIT;
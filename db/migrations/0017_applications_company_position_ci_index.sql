@@ -0,0 +1,20 @@
+--
+-- Migration: 0017_applications_company_position_ci_index.sql
+-- Purpose: Match ingestion's company + position duplicate check case-insensitively
+--
+
+BEGIN;
+
+-- Names are trimmed on write from now on; trim existing rows so they
+-- compare equal to newly ingested ones
+UPDATE applications
+SET company = btrim(company), position = btrim(position)
+WHERE company <> btrim(company) OR position <> btrim(position);
+
+-- ingest_lookup compares lower(company) and lower(position). Not UNIQUE:
+-- users may track the same role twice (e.g. re-applying), and existing
+-- data already does
+CREATE INDEX IF NOT EXISTS idx_applications_user_company_position_ci
+ON applications(user_id, lower(company), lower(position));
+
+COMMIT;
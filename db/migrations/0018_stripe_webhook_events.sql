@@ -0,0 +1,25 @@
+--
+-- Migration: 0018_stripe_webhook_events.sql
+-- Purpose: Record Stripe webhook events as they're claimed, so each is
+-- processed once across workers and restarts
+--
+
+BEGIN;
+
+-- One row per Stripe event ID (evt_...). Claimed before processing and
+-- marked processed once applied. A claim that never got marked (its worker
+-- died mid-processing) can be taken over after a few minutes. Rows older
+-- than a week are pruned on insert (Stripe stops retrying after three days)
+CREATE TABLE IF NOT EXISTS stripe_webhook_events (
+    event_id TEXT PRIMARY KEY,
+    claimed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    processed_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_events_claimed_at
+ON stripe_webhook_events(claimed_at);
+
+-- Backend only: no policies, so only the service role can touch it
+ALTER TABLE stripe_webhook_events ENABLE ROW LEVEL SECURITY;
+
+COMMIT;
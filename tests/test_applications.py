@@ -10,9 +10,13 @@ These tests verify the application management functionality:
 - Authentication and authorization
 """
 
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from app.main import app
 
@@ -154,24 +158,83 @@ async def test_list_applications_with_filters(mock_jwt):
         assert response.status_code == 200
 
 
+def test_list_applications_binds_query_model(mock_jwt):
+    """Filters and pagination are read from the query string into one model."""
+    with patch(
+        "app.services.applications.get_user_applications",
+        new=AsyncMock(return_value=([], 0)),
+    ) as mock_list:
+        response = client.get(
+            "/v1/applications/?company=acme&sort=applied_desc&skip=5&limit=10",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        
+        assert response.status_code == 200
+        kwargs = mock_list.call_args.kwargs
+        assert kwargs["company"] == "acme"
+        assert kwargs["sort"] == "applied_desc"
+        assert kwargs["status"] is None
+        # One row past the page is fetched to work out has_more
+        assert (kwargs["skip"], kwargs["limit"]) == (5, 11)
+        assert kwargs["count"] == "planned"
+        
+        response = client.get(
+            "/v1/applications/?date_from=2024-01-01",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 200
+        assert mock_list.call_args.kwargs["date_from"] == date(2024, 1, 1)
+        
+        response = client.get(
+            "/v1/applications/?date_from=not-a-date",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 422
+        
+        response = client.get(
+            "/v1/applications/?limit=500",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 422
+
+
+def test_list_applications_exact_total_is_opt_in(mock_jwt):
+    """with_total asks for an exact count; the extra row only sets has_more."""
+    rows = [{"id": str(i)} for i in range(3)]
+    with patch(
+        "app.services.applications.get_user_applications",
+        new=AsyncMock(return_value=(rows, 7)),
+    ) as mock_list:
+        response = client.get(
+            "/v1/applications/?limit=2&with_total=true",
+            headers={"Authorization": "Bearer test-token"}
+        )
+    
+    assert response.status_code == 200
+    assert mock_list.call_args.kwargs["count"] == "exact"
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 7
+    assert data["has_more"] is True
+
+
 def test_get_application_not_found(mock_jwt):
-    """Test getting a non-existent application."""
+    """Test getting a non-existent application (or another user's)."""
     with patch("app.services.applications.get_supabase_client") as mock_supabase:
-        mock_query = AsyncMock()
+        mock_query = MagicMock()
         mock_query.execute.return_value.data = []
-        
-        mock_table = AsyncMock()
-        mock_table.select.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
         
-        mock_supabase.return_value.table.return_value = mock_table
+        mock_supabase.return_value.table.return_value.select.return_value = mock_query
         
         response = client.get(
-            f"/applications/{TEST_APP_ID}",
+            f"/v1/applications/{TEST_APP_ID}",
             headers={"Authorization": "Bearer test-token"}
         )
         
         assert response.status_code == 404
+        mock_query.eq.assert_any_call("user_id", TEST_USER_ID)
 
 
 def test_update_application_partial(mock_jwt):
@@ -220,3 +283,253 @@ def test_delete_application(mock_jwt):
         assert response.status_code == 204
 
 
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_in_batches():
+    """The CSV export yields the header first, then one chunk per fetched batch."""
+    from app.services import applications as app_service
+
+    batches = [
+        [{"company": "Acme, Inc.", "position": "Engineer", "applied_at": "2024-01-02T10:00:00Z"},
+         {"company": "Globex", "position": "Analyst", "applied_at": None}],
+        [{"company": "Initech", "position": "Developer", "updated_at": datetime(2024, 3, 4, 9, 30)}],
+    ]
+    with patch.object(app_service, "CSV_EXPORT_BATCH_SIZE", 2), patch(
+        "app.services.applications.get_user_applications_page",
+        new=AsyncMock(side_effect=[(batches[0], "next"), (batches[1], None)]),
+    ) as mock_page:
+        chunks = [chunk async for chunk in app_service.iter_applications_csv(TEST_USER_ID)]
+
+    assert chunks[0].startswith(b"Company,Position,Status")
+    assert chunks[1] == b'"Acme, Inc.",Engineer,,,,,2024-01-02,\nGlobex,Analyst,,,,,,\n'
+    assert chunks[2] == b"Initech,Developer,,,,,,2024-03-04\n"
+    assert [c.kwargs["cursor"] for c in mock_page.call_args_list] == ["", "next"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_overview_is_cached_until_invalidated():
+    """Analytics are served from cache until the user's applications change."""
+    from app.services import applications as app_service
+
+    app_service._overview_cache.clear()
+    with patch("app.services.applications.get_supabase_client") as mock_supabase:
+        query = mock_supabase.return_value.table.return_value.select.return_value
+        query.eq.return_value = query
+        query.gte.return_value = query
+        query.neq.return_value = query
+        query.execute.return_value.count = 2
+        query.execute.return_value.data = [{"status": "applied"}, {"status": "interviewing"}]
+
+        first = await app_service.get_analytics_overview(TEST_USER_ID)
+        second = await app_service.get_analytics_overview(TEST_USER_ID)
+        assert second is first
+        assert mock_supabase.call_count == 1
+
+        app_service.invalidate_analytics_cache(TEST_USER_ID)
+        await app_service.get_analytics_overview(TEST_USER_ID)
+        assert mock_supabase.call_count == 2
+
+
+def test_trends_cache_invalidated_per_user():
+    """Trends are cached per (user, days) and dropped for every range of the user."""
+    from app.services import applications as app_service
+
+    app_service._trends_cache.clear()
+    app_service._trends_cache[(TEST_USER_ID, 30)] = {"days": 30}
+    app_service._trends_cache[(TEST_USER_ID, 90)] = {"days": 90}
+    app_service._trends_cache[("other-user", 30)] = {"days": 30}
+
+    app_service.invalidate_analytics_cache(TEST_USER_ID)
+    assert list(app_service._trends_cache) == [("other-user", 30)]
+
+
+def _mock_db_connection(rows):
+    """Patch get_db_connection with a connection whose cursor returns the given rows."""
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchall = AsyncMock(return_value=rows)
+    cursor.__aenter__ = AsyncMock(return_value=cursor)
+    cursor.__aexit__ = AsyncMock(return_value=False)
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+
+    @asynccontextmanager
+    async def fake_connection():
+        yield conn
+
+    return patch("app.services.applications.get_db_connection", fake_connection), cursor
+
+
+def test_list_applications_keyset_cursor(mock_jwt):
+    """Cursor pagination fetches one extra row and returns a cursor for the last row shown."""
+    from app.services import applications as app_service
+
+    rows = [
+        {"id": TEST_APP_ID, "created_at": "2024-01-02T10:00:00+00:00"},
+        {"id": "22222222-2222-2222-2222-222222222222", "created_at": "2024-01-01T10:00:00+00:00"},
+        {"id": "33333333-3333-3333-3333-333333333333", "created_at": "2023-12-31T10:00:00+00:00"},
+    ]
+    db_patch, cursor = _mock_db_connection(rows)
+    with db_patch:
+        response = client.get(
+            "/v1/applications/?cursor=&limit=2&company=acme",
+            headers={"Authorization": "Bearer test-token"}
+        )
+    
+    assert response.status_code == 200
+    sql, params = cursor.execute.call_args.args
+    assert "count" not in sql.lower()
+    assert params == (TEST_USER_ID, "%acme%", 3)
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert response.headers["x-next-cursor"] == data["next_cursor"]
+    assert response.headers["link"] == (
+        '<http://testserver/v1/applications/?limit=2&company=acme'
+        f'&cursor={data["next_cursor"]}>; rel="next"'
+    )
+    assert app_service._decode_application_cursor(data["next_cursor"]) == (
+        "2024-01-01T10:00:00+00:00",
+        "22222222-2222-2222-2222-222222222222",
+    )
+
+    db_patch, cursor = _mock_db_connection(rows[2:])
+    with db_patch:
+        response = client.get(
+            f"/v1/applications/?cursor={data['next_cursor']}&limit=2",
+            headers={"Authorization": "Bearer test-token"}
+        )
+    
+    sql, params = cursor.execute.call_args.args
+    assert "(created_at, id) <" in sql
+    assert params[1:3] == ("2024-01-01T10:00:00+00:00", "22222222-2222-2222-2222-222222222222")
+    assert response.json()["has_more"] is False
+    assert response.json()["next_cursor"] is None
+    assert "link" not in response.headers
+
+    with pytest.raises(HTTPException) as exc_info:
+        app_service._decode_application_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_exact_total_comes_from_the_page_query():
+    """An exact total is read from a count(*) OVER () column, not a second query."""
+    from app.services import applications as app_service
+
+    rows = [{"id": TEST_APP_ID, "_total": 5}, {"id": "22222222-2222-2222-2222-222222222222", "_total": 5}]
+    db_patch, cursor = _mock_db_connection(rows)
+    with db_patch:
+        page, total = await app_service.get_user_applications(
+            user_id=TEST_USER_ID, skip=2, limit=2, status="applied", count="exact"
+        )
+
+    cursor.execute.assert_awaited_once()
+    sql, params = cursor.execute.call_args.args
+    assert "count(*) OVER ()" in sql
+    assert params == (TEST_USER_ID, "applied", 2, 2)
+    assert total == 5
+    assert page == [{"id": TEST_APP_ID}, {"id": "22222222-2222-2222-2222-222222222222"}]
+
+
+def test_bulk_update_validates_items(mock_jwt):
+    """Bulk update items are validated before the service is called."""
+    with patch(
+        "app.services.applications.bulk_update_applications",
+        new=AsyncMock(return_value=[]),
+    ) as mock_bulk:
+        response = client.put(
+            "/v1/applications/bulk-update",
+            json=[{"id": TEST_APP_ID, "status": "interviewing", "order_index": 2}],
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 200
+        (item,) = mock_bulk.call_args.kwargs["updates"]
+        assert (str(item.id), item.status, item.order_index) == (TEST_APP_ID, "interviewing", 2)
+        
+        response = client.put(
+            "/v1/applications/bulk-update",
+            json=[{"id": "not-a-uuid", "order_index": "first"}],
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 422
+        assert mock_bulk.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_one_statement():
+    """All bulk-update items are sent in a single UPDATE with array parameters."""
+    from app.schemas import BulkUpdateItem
+    from app.services import applications as app_service
+
+    db_patch, cursor = _mock_db_connection([{"id": TEST_APP_ID}])
+    updates = [
+        BulkUpdateItem(id=TEST_APP_ID, order_index=0),
+        BulkUpdateItem(id="22222222-2222-2222-2222-222222222222", status="offer"),
+        BulkUpdateItem(id="33333333-3333-3333-3333-333333333333"),  # nothing to change
+    ]
+    with db_patch:
+        rows = await app_service.bulk_update_applications(TEST_USER_ID, updates)
+
+    assert rows == [{"id": TEST_APP_ID}]
+    cursor.execute.assert_awaited_once()
+    sql, (ids, statuses, order_indexes, user_id) = cursor.execute.call_args.args
+    assert "unnest" in sql
+    assert [str(i) for i in ids] == [TEST_APP_ID, "22222222-2222-2222-2222-222222222222"]
+    assert statuses == [None, "offer"]
+    assert order_indexes == [0, None]
+    assert user_id == TEST_USER_ID
+
+
+def test_item_routes_only_match_uuids(mock_jwt):
+    """Non-UUID paths under /applications never reach the item handlers."""
+    with patch(
+        "app.services.applications.get_application_by_id",
+        new=AsyncMock(return_value=None),
+    ) as mock_get:
+        response = client.get(
+            "/v1/applications/not-a-uuid",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 404
+        mock_get.assert_not_called()
+        
+        response = client.get(
+            f"/v1/applications/{TEST_APP_ID}",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == 404
+        assert mock_get.call_args.kwargs["application_id"] == TEST_APP_ID
+
+
+def test_application_names_are_trimmed():
+    """Company and position are stored without surrounding whitespace; blank names are rejected."""
+    from app.schemas import ApplicationCreate, ApplicationUpdate
+
+    data = ApplicationCreate(company="  Acme Corp ", position="Engineer\n")
+    assert (data.company, data.position) == ("Acme Corp", "Engineer")
+    assert ApplicationUpdate(position=" Lead ").position == "Lead"
+
+    with pytest.raises(ValueError):
+        ApplicationCreate(company="   ", position="Engineer")
+
+
+def test_application_status_must_be_known():
+    """Statuses outside the database enum are rejected before reaching the database."""
+    from app.deps import FilterParams
+    from app.schemas import APPLICATION_STATUSES, ApplicationCreate, ApplicationUpdate, BulkUpdateItem
+
+    assert ApplicationCreate(company="Acme", position="Engineer").status == "applied"
+    assert ApplicationUpdate(status="offer").status == "offer"
+    assert "interviewing" in APPLICATION_STATUSES
+
+    with pytest.raises(ValueError):
+        ApplicationUpdate(status="ghosted")
+    with pytest.raises(ValueError):
+        ApplicationUpdate(status="offer_received")
+    with pytest.raises(ValueError):
+        FilterParams(status="ghosted")
+    with pytest.raises(ValueError):
+        BulkUpdateItem(id=TEST_APP_ID, status="Applied")
@@ -7,9 +7,11 @@ These tests verify event tracking functionality:
 - Status updates via events
 """
 
+from contextlib import asynccontextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from app.main import app
 
@@ -44,104 +46,84 @@ def test_create_event_requires_auth():
     assert response.status_code == 403
 
 
+def _mock_db_connection(row=None, rows=()):
+    """Patch get_db_connection with a connection whose cursor returns the given row(s)."""
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchone = AsyncMock(return_value=row)
+    cursor.fetchall = AsyncMock(return_value=list(rows))
+    cursor.__aenter__ = AsyncMock(return_value=cursor)
+    cursor.__aexit__ = AsyncMock(return_value=False)
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+
+    @asynccontextmanager
+    async def fake_connection():
+        yield conn
+
+    return patch("app.routers.events.get_db_connection", fake_connection), cursor
+
+
 @pytest.mark.asyncio
 async def test_get_application_events(mock_jwt):
     """Test getting events for an application."""
-    with patch("app.routers.events.get_supabase_client") as mock_supabase:
-        # Mock application existence check
-        mock_app_query = AsyncMock()
-        mock_app_query.execute.return_value.data = [{"id": TEST_APP_ID}]
-        
-        # Mock events query
-        mock_events_query = AsyncMock()
-        mock_events_query.execute.return_value.data = [
-            {
-                "id": TEST_EVENT_ID,
-                "application_id": TEST_APP_ID,
-                "event_type": "status_change",
-                "status": "interviewing",
-                "notes": "Interview scheduled",
-                "metadata": {},
-                "created_at": "2025-10-13T10:00:00Z"
-            }
-        ]
-        
-        # Setup mock chaining
-        mock_table = AsyncMock()
-        mock_table.select.return_value = mock_app_query
-        mock_app_query.eq.return_value = mock_app_query
-        
-        # For events query
-        def table_side_effect(table_name):
-            if table_name == "applications":
-                return mock_table
-            else:  # application_events
-                events_table = AsyncMock()
-                events_table.select.return_value = mock_events_query
-                mock_events_query.eq.return_value = mock_events_query
-                mock_events_query.order.return_value = mock_events_query
-                return events_table
-        
-        mock_supabase.return_value.table.side_effect = table_side_effect
-        
+    db_patch, cursor = _mock_db_connection(rows=[
+        {
+            "id": TEST_EVENT_ID,
+            "application_id": TEST_APP_ID,
+            "event_type": "status_change",
+            "status": "interviewing",
+            "notes": "Interview scheduled",
+            "metadata": {},
+            "created_at": "2025-10-13T10:00:00Z"
+        }
+    ])
+    with db_patch:
         response = client.get(
-            f"/applications/{TEST_APP_ID}/events",
+            f"/v1/applications/{TEST_APP_ID}/events",
             headers={"Authorization": "Bearer test-token"}
         )
         
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
-        if len(data) > 0:
-            assert "event_type" in data[0]
+        assert data[0]["event_type"] == "status_change"
+        # One query, scoped to the user
+        cursor.execute.assert_awaited_once()
+        assert cursor.execute.call_args.args[1][1] == TEST_USER_ID
+
+
+def test_get_events_for_application_without_events(mock_jwt):
+    """An owned application with no events yields one all-NULL joined row."""
+    empty_row = dict.fromkeys(
+        ["id", "application_id", "event_type", "status", "notes", "metadata", "created_at"]
+    )
+    db_patch, _ = _mock_db_connection(rows=[empty_row])
+    with db_patch:
+        response = client.get(
+            f"/v1/applications/{TEST_APP_ID}/events",
+            headers={"Authorization": "Bearer test-token"}
+        )
+    
+    assert response.status_code == 200
+    assert response.json() == []
 
 
 @pytest.mark.asyncio
 async def test_create_application_event(mock_jwt):
     """Test creating a new event for an application."""
-    with patch("app.routers.events.get_supabase_client") as mock_supabase:
-        # Mock application existence check
-        mock_app_query = AsyncMock()
-        mock_app_query.execute.return_value.data = [{"id": TEST_APP_ID}]
-        
-        # Mock event creation
-        mock_event_query = AsyncMock()
-        mock_event_query.execute.return_value.data = [{
-            "id": TEST_EVENT_ID,
-            "application_id": TEST_APP_ID,
-            "event_type": "phone_screen",
-            "status": "screening",
-            "notes": "Had phone screen with recruiter",
-            "metadata": {"interviewer": "Jane Smith"},
-            "created_at": "2025-10-13T10:00:00Z"
-        }]
-        
-        # Mock status update
-        mock_update_query = AsyncMock()
-        mock_update_query.execute.return_value.data = [{}]
-        
-        # Setup mock chaining
-        call_count = [0]
-        
-        def table_side_effect(table_name):
-            call_count[0] += 1
-            mock_table = AsyncMock()
-            
-            if call_count[0] == 1:  # First call: check app exists
-                mock_table.select.return_value = mock_app_query
-                mock_app_query.eq.return_value = mock_app_query
-            elif call_count[0] == 2:  # Second call: insert event
-                mock_table.insert.return_value = mock_event_query
-            else:  # Third call: update status
-                mock_table.update.return_value = mock_update_query
-                mock_update_query.eq.return_value = mock_update_query
-            
-            return mock_table
-        
-        mock_supabase.return_value.table.side_effect = table_side_effect
-        
+    db_patch, cursor = _mock_db_connection({
+        "id": TEST_EVENT_ID,
+        "application_id": TEST_APP_ID,
+        "event_type": "phone_screen",
+        "status": "screening",
+        "notes": "Had phone screen with recruiter",
+        "metadata": {"interviewer": "Jane Smith"},
+        "created_at": "2025-10-13T10:00:00Z"
+    })
+    with db_patch:
         response = client.post(
-            f"/applications/{TEST_APP_ID}/events",
+            f"/v1/applications/{TEST_APP_ID}/events",
             headers={"Authorization": "Bearer test-token"},
             json={
                 "event_type": "phone_screen",
@@ -155,26 +137,34 @@ async def test_create_application_event(mock_jwt):
         data = response.json()
         assert data["event_type"] == "phone_screen"
         assert data["status"] == "screening"
+        # Ownership check, insert and status update are a single statement
+        cursor.execute.assert_awaited_once()
+        params = cursor.execute.call_args.args[1]
+        assert params["user_id"] == TEST_USER_ID
+        assert params["status"] == "screening"
+
+
+def test_create_event_for_nonexistent_application(mock_jwt):
+    """Test that an insert matching no owned application returns 404."""
+    db_patch, _ = _mock_db_connection(None)
+    with db_patch:
+        response = client.post(
+            f"/v1/applications/{TEST_APP_ID}/events",
+            headers={"Authorization": "Bearer test-token"},
+            json={"event_type": "note", "notes": "Test note"}
+        )
+    
+    assert response.status_code == 404
 
 
 def test_get_events_for_nonexistent_application(mock_jwt):
     """Test getting events for application that doesn't exist."""
-    with patch("app.routers.events.get_supabase_client") as mock_supabase:
-        # Mock application not found
-        mock_query = AsyncMock()
-        mock_query.execute.return_value.data = []
-        
-        mock_table = AsyncMock()
-        mock_table.select.return_value = mock_query
-        mock_query.eq.return_value = mock_query
-        
-        mock_supabase.return_value.table.return_value = mock_table
-        
+    # Mock application not found
+    db_patch, _ = _mock_db_connection(rows=[])
+    with db_patch:
         response = client.get(
-            f"/applications/{TEST_APP_ID}/events",
+            f"/v1/applications/{TEST_APP_ID}/events",
             headers={"Authorization": "Bearer test-token"}
         )
         
         assert response.status_code == 404
-
-
@@ -9,10 +9,14 @@ Testing in FastAPI:
 - Mock external dependencies to avoid side effects
 """
 
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.routers import health
 
 # Create a test client
 # This allows us to make requests to the app without running a server
@@ -61,15 +65,40 @@ def test_detailed_health_check() -> None:
     
     The detailed health check should provide status
     of various components (database, external services, etc.)
+    and reuse a healthy result for a few seconds.
     """
-    response = client.get("/health/detailed")
+    health._detailed_health_cache = None
+    check_database = AsyncMock()
+    with patch("app.routers.health._check_database", check_database), \
+         patch("app.routers.health._check_supabase", AsyncMock()):
+        response = client.get("/v1/health/detailed")
+        client.get("/v1/health/detailed")
     
     assert response.status_code == 200
     
     data = response.json()
-    assert "status" in data
-    assert "checks" in data
-    assert isinstance(data["checks"], dict)
+    assert data["status"] == "ok"
+    assert data["checks"] == {"database": "ok", "supabase": "ok"}
+    assert check_database.await_count == 1
+
+
+def test_detailed_health_check_reports_failures() -> None:
+    """
+    Test that a failing or slow dependency turns the detailed check into a 503.
+    """
+    health._detailed_health_cache = None
+    
+    async def slow_check() -> None:
+        await asyncio.sleep(1)
+    
+    with patch("app.routers.health._check_database", AsyncMock(side_effect=OSError("down"))), \
+         patch("app.routers.health._check_supabase", slow_check), \
+         patch("app.routers.health.PROBE_TIMEOUT", 0.01):
+        response = client.get("/v1/health/detailed")
+    
+    assert response.status_code == 503
+    assert response.json()["checks"] == {"database": "error", "supabase": "timeout"}
+    assert health._detailed_health_cache is None
 
 
 @pytest.mark.asyncio
@@ -101,3 +130,13 @@ def test_health_response_format() -> None:
     assert "status" in data
     assert isinstance(data["status"], str)
 
+
+def test_health_response_headers() -> None:
+    """
+    Test that the cache and security headers are added to responses.
+    """
+    response = client.get("/health")
+    
+    assert response.headers["Cache-Control"] == "public, max-age=30"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
@@ -94,16 +94,16 @@ async def test_ingest_email_success(mock_jwt, sample_email):
 
 @pytest.mark.asyncio
 async def test_ingest_email_duplicate(mock_jwt, sample_email):
-    """Test duplicate email detection."""
-    with patch("app.services.emails.check_duplicate_email") as mock_check_dup:
-        # Mock existing duplicate
-        mock_check_dup.return_value = {
-            "id": "existing-email-id",
-            "application_id": TEST_APP_ID,
-        }
-        
+    """Test duplicate email detection from the single ingest lookup."""
+    lookup = AsyncMock(return_value={
+        "app_by_hash": {"id": TEST_APP_ID, "status": "applied", "source_url": None},
+        "app_by_company_position": None,
+    })
+    with patch("app.routers.ingest.profile_service.ensure_profile", AsyncMock(return_value=False)), \
+         patch("app.routers.ingest.ingest_lookup", lookup), \
+         patch("app.routers.ingest.check_duplicate_email") as mock_check_dup:
         response = client.post(
-            "/ingest/email",
+            "/v1/ingest/email",
             headers={"Authorization": "Bearer test-token"},
             json=sample_email
         )
@@ -113,6 +113,82 @@ async def test_ingest_email_duplicate(mock_jwt, sample_email):
         assert data["success"] is True
         assert data["duplicate"] is True
         assert data["application_id"] == TEST_APP_ID
+    
+    user_id, _email_hash, company, position = lookup.call_args.args
+    assert (user_id, company, position) == (TEST_USER_ID, "Acme", "Software Engineer")
+    mock_check_dup.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_ingest_email_keeps_create_errors(mock_jwt, sample_email):
+    """A subscription limit stays a 403; a rejected write is a 4xx, not a 500."""
+    from fastapi import HTTPException
+    from postgrest.exceptions import APIError
+    
+    lookup = AsyncMock(return_value={"app_by_hash": None, "app_by_company_position": None})
+    limit = HTTPException(status_code=403, detail={"error": "limit_exceeded"})
+    conflict = APIError({"code": "23505", "message": "duplicate key value"})
+    with patch("app.routers.ingest.profile_service.ensure_profile", AsyncMock(return_value=False)), \
+         patch("app.routers.ingest.ingest_lookup", lookup), \
+         patch("app.routers.ingest.create_application", AsyncMock(side_effect=[limit, conflict])):
+        responses = [
+            client.post(
+                "/v1/ingest/email",
+                headers={"Authorization": "Bearer test-token"},
+                json=sample_email,
+            )
+            for _ in range(2)
+        ]
+    
+    assert [r.status_code for r in responses] == [403, 409]
+    assert responses[0].json()["detail"]["error"] == "limit_exceeded"
+
+
+@pytest.mark.asyncio
+async def test_ingest_emails_batch(mock_jwt, sample_email):
+    """A batch is looked up and created in bulk, one result per email."""
+    follow_up = {**sample_email, "received_at": "2025-10-14T10:00:00Z"}
+    newsletter = {
+        "sender": "news@medium.com",
+        "subject": "Your weekly digest",
+        "text_body": "Top stories this week.",
+    }
+    lookup = AsyncMock(return_value=[
+        {"app_by_hash": None, "app_by_company_position": None},
+    ] * 3)
+    create = AsyncMock(return_value=[{"id": TEST_APP_ID}])
+    with patch("app.routers.ingest.profile_service.ensure_profile", AsyncMock(return_value=False)) as mock_profile, \
+         patch("app.routers.ingest.ingest_lookup_many", lookup), \
+         patch("app.routers.ingest.create_applications", create), \
+         patch("app.routers.ingest.store_email_messages", AsyncMock()) as mock_store:
+        response = client.post(
+            "/v1/ingest/emails",
+            headers={"Authorization": "Bearer test-token"},
+            json=[sample_email, follow_up, newsletter],
+        )
+    
+    assert response.status_code == 200
+    created, tracked, skipped = response.json()
+    assert (created["success"], created["duplicate"], created["application_id"]) == (True, False, TEST_APP_ID)
+    assert (tracked["success"], tracked["duplicate"], tracked["application_id"]) == (True, True, TEST_APP_ID)
+    assert (skipped["success"], skipped["application_id"]) == (False, None)
+    
+    mock_profile.assert_awaited_once()
+    lookup.assert_awaited_once()
+    _user_id, new_apps = create.call_args.args
+    assert [(a.company, a.position) for a in new_apps] == [("Acme", "Software Engineer")]
+    stored = mock_store.call_args.args[0]
+    assert [application_id for _email, application_id in stored] == [TEST_APP_ID]
+
+
+def test_ingest_emails_batch_is_capped(mock_jwt, sample_email):
+    """More than 100 emails in one batch are rejected."""
+    response = client.post(
+        "/v1/ingest/emails",
+        headers={"Authorization": "Bearer test-token"},
+        json=[sample_email] * 101,
+    )
+    assert response.status_code == 422
 
 
 @pytest.mark.asyncio
@@ -196,3 +272,64 @@ def test_parsing_service_detects_status():
     assert detect_status_from_content("Congratulations!", "pleased to offer") == "offer"
 
 
+
+
+def test_job_detection_skips_ai_when_keywords_match():
+    """The OpenAI check only runs for emails the keyword heuristics reject."""
+    from app.services.parsing import EmailParser
+    
+    job_email = EmailIngest(
+        sender="jobs@acme.com",
+        subject="Application Received - Software Engineer",
+        text_body="Thank you for applying.",
+    )
+    digest = EmailIngest(
+        sender="alerts@ziprecruiter.com",
+        subject="Jobs you may like",
+        text_body="Interview-ready roles near you.",
+    )
+    
+    with patch("app.services.parsing.settings.openai_api_key", "sk-test"), \
+         patch("app.services.parsing.detect_job_application_with_ai",
+               return_value={"is_job_application": False}) as mock_ai:
+        assert EmailParser()._is_job_application(job_email) is True
+        mock_ai.assert_not_called()
+        
+        assert EmailParser()._is_job_application(digest) is False
+        mock_ai.assert_called_once()
+
+
+def test_email_hash_is_stable():
+    """
+    The dedup hash must not change: stored email_messages rows are matched on it.
+    
+    Only sender, subject and received_at are hashed (normalized), so changing
+    the algorithm would buy nothing and make every ingested email look new.
+    """
+    from app.services.emails import generate_email_hash
+    
+    email = EmailIngest(
+        sender=" Jobs@Acme.com",
+        subject="Hi ",
+        text_body="x" * 10_000,
+        received_at="2025-10-13T10:00:00Z",
+    )
+    
+    assert generate_email_hash(email) == (
+        "82e9d92218014b6a15ab2f8bfa636ff7a96170bee1aaba4d7b8acb7022f67286"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_profile_is_remembered():
+    """A user's profile is looked up once, then remembered."""
+    from app.services import profiles
+    
+    profiles._known_profiles.clear()
+    with patch("app.services.profiles.get_profile", AsyncMock(return_value=None)) as mock_get, \
+         patch("app.services.profiles.create_default_profile", AsyncMock()) as mock_create:
+        assert await profiles.ensure_profile(TEST_USER_ID) is True
+        assert await profiles.ensure_profile(TEST_USER_ID) is False
+    
+    mock_get.assert_awaited_once_with(TEST_USER_ID)
+    mock_create.assert_awaited_once_with(TEST_USER_ID)